@@ -3,9 +3,6 @@
 import base64
 import json
 import logging
-import kubernetes
-import kubernetes.client
-import kubernetes.config
 
 from src.auth.providers.types import AuthProvider, AuthenticationError
 
@@ -25,6 +22,10 @@ class OpenShiftAuthProvider(AuthProvider):
 
     def __init__(self):
         """Initialize the OpenShift authentication provider."""
+        # kubernetes is slow to import and only needed in OpenShift mode
+        import kubernetes.client
+        import kubernetes.config
+
         try:
             kubernetes.config.load_incluster_config()
             self._k8s_client = kubernetes.client.CoreV1Api()
@@ -42,6 +43,8 @@ class OpenShiftAuthProvider(AuthProvider):
         Raises:
             ClusterPullSecretNotFoundError: If pull secret cannot be retrieved
         """
+        import kubernetes.client
+
         try:
             secret = self._k8s_client.read_namespaced_secret(
                 "pull-secret", "openshift-config"
@@ -74,6 +77,8 @@ class OpenShiftAuthProvider(AuthProvider):
         Raises:
             ClusterIDNotFoundError: If cluster ID cannot be retrieved
         """
+        import kubernetes.client
+
         try:
             # Get cluster version to extract cluster ID
             config_client = kubernetes.client.CustomObjectsApi()
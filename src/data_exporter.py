@@ -7,6 +7,7 @@ When `cp_offline_token` is provided via config (either for prod or stage),
 it is used for ingress authentication instead of cluster pull-secret.
 """
 
+import functools
 import io
 import pathlib
 import tarfile
@@ -14,6 +15,7 @@ from pathlib import Path
 import logging
 import threading
 import time
+from collections.abc import Iterable
 import requests
 
 from src.file_handler import FileHandler
@@ -25,12 +27,13 @@ logger = logging.getLogger(__name__)
 
 
 def package_files_into_tarball(
-    file_paths: list[pathlib.Path], path_to_strip: str
+    file_paths: Iterable[pathlib.Path],
+    path_to_strip: str,
 ) -> io.BytesIO:
     """Package specified directory into a tarball.
 
     Args:
-        file_paths: List of paths to the files to be packaged.
+        file_paths: Paths to the files to be packaged.
         path_to_strip: Path to be stripped from the file paths (not
             included in the archive).
 
@@ -39,14 +42,20 @@ def package_files_into_tarball(
     """
     tarball_io = io.BytesIO()
     with tarfile.open(fileobj=tarball_io, mode="w:gz") as tar:
-        # arcname parameter is set to a stripped path to avoid including
-        # the full path of the root dir
         for file_path in file_paths:
+            # arcname parameter is set to a stripped path to avoid including
+            # the full path of the root dir; gettarinfo lstats the file once
+            tarinfo = tar.gettarinfo(
+                file_path, arcname=file_path.as_posix().replace(path_to_strip, "")
+            )
             # skip symlinks as those are a potential security risk
-            if not file_path.is_symlink():
-                tar.add(
-                    file_path, arcname=file_path.as_posix().replace(path_to_strip, "")
-                )
+            if tarinfo.issym():
+                continue
+            if tarinfo.isreg():
+                with open(file_path, "rb") as fileobj:
+                    tar.addfile(tarinfo, fileobj)
+            else:
+                tar.addfile(tarinfo)
 
     tarball_io.seek(0)
 
@@ -81,17 +90,19 @@ class DataCollectorService:
             config.data_dir, allowed_subdirs=config.allowed_subdirs
         )
 
-        # Initialize ingress client for uploads
-        self.ingress_client = IngressClient(
-            ingress_server_url=config.ingress_server_url,
-            ingress_server_auth_token=config.ingress_server_auth_token,
-            service_id=config.service_id,
-            identity_id=config.identity_id,
-            connection_timeout=config.ingress_connection_timeout,
-        )
-
         self.shutdown_event = threading.Event()
 
+    @functools.cached_property
+    def ingress_client(self) -> IngressClient:
+        """Ingress client for uploads, created on first use."""
+        return IngressClient(
+            ingress_server_url=self.config.ingress_server_url,
+            ingress_server_auth_token=self.config.ingress_server_auth_token,
+            service_id=self.config.service_id,
+            identity_id=self.config.identity_id,
+            connection_timeout=self.config.ingress_connection_timeout,
+        )
+
     def _process_data_collection(self) -> None:
         """Process a single data collection cycle."""
         collected_files = self.file_handler.collect_files()
@@ -135,7 +146,7 @@ class DataCollectorService:
         if self.cleanup_after_send:
             self.file_handler.delete_collected_files(data_chunk)
 
-    def run(self) -> None:
+    def run(self, max_iterations: int | None = None) -> None:
         """Run the data collection service.
 
         This method determines the operating mode and delegates to the appropriate handler:
@@ -145,7 +156,17 @@ class DataCollectorService:
 
         The method logs service configuration and handles mode detection based on
         whether a collection interval is configured.
+
+        Args:
+            max_iterations: Optional upper bound on the number of collection cycles
+                in continuous mode. None means run until shutdown is requested.
+
+        Raises:
+            ValueError: If max_iterations is less than 1.
         """
+        if max_iterations is not None and max_iterations < 1:
+            raise ValueError(f"max_iterations must be at least 1, got {max_iterations}")
+
         logger.info("Starting data collection service")
         logger.info("Data directory: %s", self.data_dir)
         logger.info("Service ID: %s", self.config.service_id)
@@ -159,10 +180,19 @@ class DataCollectorService:
         else:
             logger.info("Collection interval: %d seconds", self.collection_interval)
 
-        if in_single_shot_mode:
-            self._run_single_shot()
-        else:
-            self._run_continuous()
+        try:
+            if in_single_shot_mode:
+                self._run_single_shot()
+            else:
+                self._run_continuous(max_iterations)
+        finally:
+            self._close_ingress_client()
+
+    def _close_ingress_client(self) -> None:
+        """Close the ingress client's connections if an upload created it."""
+        ingress_client = self.__dict__.pop("ingress_client", None)
+        if ingress_client is not None:
+            ingress_client.close()
 
     def _run_single_shot(self) -> None:
         """Execute single-shot data collection."""
@@ -180,17 +210,28 @@ class DataCollectorService:
             # whatever retry policy it wants.
             raise e
 
-    def _run_continuous(self) -> None:
+    def _run_continuous(self, max_iterations: int | None = None) -> None:
         """Execute continuous data collection loop.
 
         Runs periodic data collection until shutdown is requested. Performs a final
         collection before shutdown for graceful termination (SIGTERM), but skips it
         for user interrupts (Ctrl+C) to allow immediate exit.
+
+        Args:
+            max_iterations: Optional upper bound on the number of collection cycles.
+                When reached, the loop exits without waiting and without a final
+                collection.
         """
         user_interrupted = False
+        iteration_limit_reached = False
+        iterations = 0
 
         # Main collection loop
         while not self.shutdown_event.is_set():
+            iterations += 1
+            if max_iterations is not None and iterations >= max_iterations:
+                iteration_limit_reached = True
+
             try:
                 logger.info("Starting data collection")
 
@@ -198,6 +239,13 @@ class DataCollectorService:
                 next_collection = time.time() + self.collection_interval
                 self._process_data_collection()
 
+                if iteration_limit_reached:
+                    logger.info(
+                        "Reached maximum number of collection cycles (%d), stopping",
+                        max_iterations,
+                    )
+                    break
+
                 time_to_wait = next_collection - time.time()
                 if time_to_wait > 0:
                     logger.info(
@@ -224,6 +272,13 @@ class DataCollectorService:
             except (OSError, requests.RequestException) as e:
                 logger.error("Error during data collection: %s", e, exc_info=True)
 
+                if iteration_limit_reached:
+                    logger.info(
+                        "Reached maximum number of collection cycles (%d), stopping",
+                        max_iterations,
+                    )
+                    break
+
                 # Retry logic with shutdown awareness
                 if not self.shutdown_event.is_set():
                     logger.info(
@@ -242,7 +297,8 @@ class DataCollectorService:
                     break
 
         # Only perform final collection for graceful shutdowns, not user interrupts
-        if not user_interrupted:
+        # or bounded runs
+        if not user_interrupted and not iteration_limit_reached:
             logger.info("Performing final collection before shutdown")
             # Exceptions (other than KeyboardInterrupt) here should bubble up because they indicate
             # there is data that potentially will not be sent before the process terminates.
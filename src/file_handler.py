@@ -4,8 +4,13 @@ This module provides the FileHandler class which encapsulates all file-related
 operations including collection, filtering, chunking, and cleanup.
 """
 
+import bisect
+import os
 import pathlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Collection
+from operator import itemgetter
 from pathlib import Path
 
 from src.constants import MAX_PAYLOAD_SIZE, MAX_DATA_DIR_SIZE
@@ -55,38 +60,67 @@ def _cleanup_empty_directories(dir_path: pathlib.Path, root_dir: pathlib.Path) -
         )
 
 
+def _unlink_file(file_path: pathlib.Path) -> bool:
+    """Delete a single file, logging any failure.
+
+    Args:
+        file_path: Path to the file to be deleted.
+
+    Returns:
+        True if the file was deleted, False otherwise.
+    """
+    try:
+        # os.unlink skips the pathlib dispatch; a call that does not raise
+        # has removed the file, so there is no need to check afterwards
+        os.unlink(file_path)
+    except FileNotFoundError:
+        logger.debug("File '%s' already deleted or does not exist", file_path)
+        return False
+    except OSError as e:
+        logger.error("Failed to remove '%s': %s", file_path, e)
+        return False
+    return True
+
+
 def delete_files(
     file_paths: list[pathlib.Path], root_dir: pathlib.Path | None = None
 ) -> None:
     """Delete files from the provided paths.
 
-    After deleting each file, if root_dir is provided, recursively removes empty
-    parent directories up to (but not including) the root_dir.
+    Files are unlinked concurrently on a thread pool, since unlink is a
+    blocking syscall that releases the GIL. After that, if root_dir is
+    provided, empty parent directories of the deleted files are removed up to
+    (but not including) the root_dir.
 
     Args:
         file_paths: List of paths to the files to be deleted.
         root_dir: Optional root directory for cleanup. If provided, empty parent
             directories will be removed up to this root. If None, only files are deleted.
     """
-    for file_path in file_paths:
-        logger.debug("Removing '%s'", file_path)
-        file_deleted = False
-        try:
-            file_path.unlink()
-            file_deleted = True
-        except FileNotFoundError:
-            logger.debug("File '%s' already deleted or does not exist", file_path)
-        except OSError as e:
-            logger.error("Failed to remove '%s': %s", file_path, e)
-        else:
-            if file_path.exists():
-                logger.error("Failed to remove '%s'", file_path)
-
-        # Clean up empty parent directories if root_dir is provided and file was deleted
-        # NOTE: Per-file cleanup is sufficient for expected volumes (hundreds of files).
-        # If performance issues arise with higher volumes, consider batching: collect all
-        # parent directories first, then do a single cleanup sweep after all files are deleted.
-        if file_deleted and root_dir is not None:
+    if len(file_paths) <= 1:
+        deleted = [_unlink_file(file_path) for file_path in file_paths]
+    else:
+        with ThreadPoolExecutor(max_workers=min(32, len(file_paths))) as executor:
+            deleted = list(executor.map(_unlink_file, file_paths))
+
+    # One summary line instead of a debug record per file; failures are
+    # still logged individually by _unlink_file
+    if file_paths and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Removed %d of %d files: %s%s",
+            sum(deleted),
+            len(file_paths),
+            ", ".join(map(str, file_paths[:5])),
+            ", ..." if len(file_paths) > 5 else "",
+        )
+
+    if root_dir is None:
+        return
+
+    # Clean up empty parent directories of deleted files sequentially, so
+    # threads never race on removing the same directory
+    for file_path, file_deleted in zip(file_paths, deleted):
+        if file_deleted:
             _cleanup_empty_directories(file_path.parent, root_dir)
 
 
@@ -101,7 +135,7 @@ def filter_symlinks(files: list[pathlib.Path]) -> list[pathlib.Path]:
     """
     filtered_files = []
     for file_path in files:
-        if file_path.is_symlink():
+        if os.path.islink(file_path):
             logger.warning("Skipping symlink '%s' for security reasons", file_path)
         else:
             filtered_files.append(file_path)
@@ -113,6 +147,11 @@ def chunk_data(
 ) -> list[list[pathlib.Path]]:
     """Chunk the data into smaller parts.
 
+    Files are packed Best-Fit-Decreasing: largest first, each into the chunk
+    with the least remaining space that can still hold it. This keeps the
+    number of chunks (and so uploads) low. Files larger than chunk_max_size
+    can never fit and are dropped with a warning.
+
     Args:
         data: List of tuples containing (file_path, file_size_bytes).
         chunk_max_size: Maximum size of a chunk.
@@ -120,20 +159,56 @@ def chunk_data(
     Returns:
         List of lists of paths to the chunked files.
     """
-    # Create chunks that don't exceed the maximum chunk size
-    chunk_size = 0
-    chunks: list[list[pathlib.Path]] = []
-    chunk: list[pathlib.Path] = []
-    for file_path, file_size in data:
-        # Start a new chunk if adding this file would exceed the size limit
-        if chunk and chunk_size + file_size > chunk_max_size:
-            chunks.append(chunk)
-            chunk = []
-            chunk_size = 0
-        chunk.append(file_path)
-        chunk_size += file_size
-    if chunk:
-        chunks.append(chunk)
+    packable = [entry for entry in data if entry[1] <= chunk_max_size]
+    if len(packable) < len(data):
+        for file_path, file_size in data:
+            if file_size > chunk_max_size:
+                logger.warning(
+                    "File '%s' (size: %d bytes) exceeds the chunk size of %d bytes "
+                    "and was left out",
+                    file_path,
+                    file_size,
+                    chunk_max_size,
+                )
+        data = packable
+
+    # Every chunk holds at most chunk_max_size bytes, so at least this many
+    # chunks are needed; allocate them up front and only grow past it. A
+    # non-positive chunk size leaves at most empty files, so skip the estimate
+    estimated_chunks = (
+        -(-sum(file_size for _, file_size in data) // chunk_max_size)
+        if chunk_max_size > 0
+        else 0
+    )
+    chunks: list[list[pathlib.Path]] = [[] for _ in range(estimated_chunks)]
+    opened_chunks = 0
+    # Chunk indexes grouped by their remaining size, plus the distinct
+    # remaining sizes kept sorted so the best fit is a single bisect
+    chunks_by_remaining: dict[int, list[int]] = {}
+    remaining_sizes: list[int] = []
+    for file_path, file_size in sorted(data, key=itemgetter(1), reverse=True):
+        # Find the fullest chunk that still has room for this file
+        position = bisect.bisect_left(remaining_sizes, file_size)
+        if position < len(remaining_sizes):
+            remaining_size = remaining_sizes[position]
+            chunk_indexes = chunks_by_remaining[remaining_size]
+            chunk_index = chunk_indexes.pop()
+            if not chunk_indexes:
+                del chunks_by_remaining[remaining_size]
+                del remaining_sizes[position]
+        else:
+            remaining_size, chunk_index = chunk_max_size, opened_chunks
+            opened_chunks += 1
+            if chunk_index == len(chunks):
+                chunks.append([])
+        chunks[chunk_index].append(file_path)
+
+        remaining_size -= file_size
+        if remaining_size in chunks_by_remaining:
+            chunks_by_remaining[remaining_size].append(chunk_index)
+        else:
+            chunks_by_remaining[remaining_size] = [chunk_index]
+            bisect.insort(remaining_sizes, remaining_size)
     return chunks
 
 
@@ -143,7 +218,7 @@ class FileHandler:
     def __init__(
         self,
         data_dir: Path,
-        allowed_subdirs: list[str] | None = None,
+        allowed_subdirs: Collection[str] | None = None,
         max_data_dir_size: int = MAX_DATA_DIR_SIZE,
         max_payload_size: int = MAX_PAYLOAD_SIZE,
     ):
@@ -151,27 +226,36 @@ class FileHandler:
 
         Args:
             data_dir: Directory to collect files from
-            allowed_subdirs: List of allowed subdirectories to include. None or empty list means collect from all subdirectories.
+            allowed_subdirs: Collection of allowed subdirectories to include. None or empty means collect from all subdirectories.
             max_data_dir_size: Maximum total size for data directory
             max_payload_size: Maximum size for individual payloads/chunks
         """
         self.data_dir = data_dir
-        self.allowed_subdirs = allowed_subdirs or []
+        # Kept as a frozenset for cheap membership checks in hot loops
+        self.allowed_subdirs = frozenset(allowed_subdirs or ())
         self.max_data_dir_size = max_data_dir_size
         self.max_payload_size = max_payload_size
 
     def filter_allowed_files(self, files: list[Path]) -> list[Path]:
-        """Filter files to only include allowed subdirectories."""
+        """Filter files to only include allowed subdirectories.
+
+        Without an allow-list the input list itself is returned, not a copy.
+        """
         # If no allowed subdirs specified, collect all files
         if not self.allowed_subdirs:
             return files
 
+        # The first directory component below data_dir sits at this index
+        data_dir_parts = self.data_dir.parts
+        data_dir_depth = len(data_dir_parts)
         filtered_files: list[Path] = []
         for file in files:
-            # Strip the data_dir prefix and get the first directory component
-            relative_path = file.relative_to(self.data_dir)
-            first_dir = relative_path.parts[0] if relative_path.parts else None
-            if first_dir in self.allowed_subdirs:
+            parts = file.parts
+            if (
+                len(parts) > data_dir_depth
+                and parts[:data_dir_depth] == data_dir_parts
+                and parts[data_dir_depth] in self.allowed_subdirs
+            ):
                 filtered_files.append(file)
 
         # Log warning if there are unknown files
@@ -183,6 +267,74 @@ class FileHandler:
 
         return filtered_files
 
+    def _scan_data_dir(self) -> list[tuple[Path, int]]:
+        """Walk the data directory once and list its JSON files with sizes.
+
+        Symlinks are skipped for security reasons and top-level entries outside
+        the allowed subdirectories are not descended into. Only skipped JSON
+        files are warned about; other skipped entries (symlinked directories,
+        stray top-level directories) are summed up at debug level, so a
+        long-running collector does not repeat them every cycle. Directories
+        that cannot be listed are skipped with a warning. Symlink checks come
+        from the cached directory entries, so each file costs a single lstat.
+
+        Returns:
+            List of tuples containing (file_path, file_size_bytes).
+        """
+        files_with_sizes: list[tuple[Path, int]] = []
+        # Bound once so the per-entry loop avoids repeated attribute lookups
+        add_file = files_with_sizes.append
+        allowed_subdirs = self.allowed_subdirs
+        unknown_files = 0
+        other_skipped_entries = 0
+        # Directories are walked as plain strings; only collected files are
+        # turned into Path objects
+        top_directory = os.fspath(self.data_dir)
+        directories = [top_directory]
+        while directories:
+            directory = directories.pop()
+            filter_top_level = bool(allowed_subdirs) and directory == top_directory
+            try:
+                entries = os.scandir(directory)
+            except OSError as e:
+                # An unreadable or vanished directory must not abort the
+                # whole collection; its files are picked up once readable
+                logger.warning("Skipping directory '%s': %s", directory, e)
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_symlink():
+                        if entry.name.endswith(".json"):
+                            logger.warning(
+                                "Skipping symlink '%s' for security reasons",
+                                entry.path,
+                            )
+                        else:
+                            other_skipped_entries += 1
+                    elif filter_top_level and entry.name not in allowed_subdirs:
+                        if entry.name.endswith(".json"):
+                            unknown_files += 1
+                        else:
+                            other_skipped_entries += 1
+                    elif entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+                    elif entry.name.endswith(".json"):
+                        file_size = entry.stat(follow_symlinks=False).st_size
+                        add_file((Path(entry.path), file_size))
+
+        if unknown_files > 0:
+            logger.warning(
+                "Skipped %s unknown files outside allowed subdirectories",
+                unknown_files,
+            )
+        if other_skipped_entries > 0:
+            logger.debug(
+                "Skipped %s symlinks and entries outside allowed subdirectories",
+                other_skipped_entries,
+            )
+
+        return files_with_sizes
+
     def collect_files(self) -> list[tuple[Path, int]]:
         """Perform a single collection operation.
 
@@ -194,24 +346,17 @@ class FileHandler:
             logger.warning("Data directory %s does not exist", self.data_dir)
             return []
 
-        # Collect all files to be packed into tarball
-        all_files = list(self.data_dir.rglob("*.json"))
-
-        # Filter out symlinks for security reasons
-        all_files = filter_symlinks(all_files)
-
-        # Filter by allowed subdirectories
-        all_files = self.filter_allowed_files(all_files)
+        # Collect all files to be packed into tarball along with their sizes
+        all_files = self._scan_data_dir()
 
         logger.debug("Collected %d files from %s", len(all_files), self.data_dir)
 
         if not all_files:
             return []
 
-        # Collect file sizes along with paths and remove oversized files
+        # Remove oversized files
         files_with_sizes = []
-        for file_path in all_files:
-            file_size = file_path.stat().st_size
+        for file_path, file_size in all_files:
             if file_size > self.max_payload_size:
                 logger.warning(
                     "File '%s' (size: %d bytes) is too big for export and was removed. "
@@ -285,8 +430,10 @@ class FileHandler:
             )
             logger.info("Removing files to fit the data into the limit...")
             extra_size = data_size - self.max_data_dir_size
+            files_to_delete = []
             for file_path, file_size in collected_files:
                 extra_size -= file_size
-                self.delete_collected_files([file_path])
+                files_to_delete.append(file_path)
                 if extra_size < 0:
                     break
+            self.delete_collected_files(files_to_delete)
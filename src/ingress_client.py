@@ -39,6 +39,21 @@ class IngressClient:
         self.identity_id = identity_id
         self.connection_timeout = connection_timeout
 
+        # One session for all uploads so the TCP/TLS connection is reused.
+        # Its default adapter pools connections without retrying, and the
+        # headers replace the requests defaults so uploads send exactly these
+        headers: dict[str, str | bytes]
+        headers = {
+            "User-Agent": USER_AGENT.format(identity_id=identity_id),
+            "Authorization": f"Bearer {ingress_server_auth_token}",
+        }
+        self._session = requests.Session()
+        self._session.headers = headers
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self._session.close()
+
     def _upload_data_to_ingress(self, tarball: io.BytesIO) -> requests.Response:
         """Upload the tarball to the Ingress server.
 
@@ -49,24 +64,20 @@ class IngressClient:
             Response object from the Ingress server.
         """
         logger.info("Sending collected data")
-        payload = {
-            "file": (
-                TARBALL_FILENAME,
-                tarball.read(),
-                CONTENT_TYPE.format(service_id=self.service_id),
-            ),
-        }
-
-        headers: dict[str, str | bytes]
-        headers = {
-            "User-Agent": USER_AGENT.format(identity_id=self.identity_id),
-            "Authorization": f"Bearer {self.ingress_server_auth_token}",
-        }
 
-        with requests.Session() as s:
-            s.headers = headers
+        # Hand the tarball's buffer to the multipart encoder as a zero-copy
+        # view instead of reading it into a second bytes object first. The
+        # view is released before returning so the tarball can be closed.
+        with tarball.getbuffer() as tarball_data:
+            payload = {
+                "file": (
+                    TARBALL_FILENAME,
+                    tarball_data,
+                    CONTENT_TYPE.format(service_id=self.service_id),
+                ),
+            }
             logger.debug("Posting payload to %s", self.ingress_server_url)
-            response = s.post(
+            response = self._session.post(
                 url=self.ingress_server_url,
                 files=payload,
                 timeout=self.connection_timeout,
@@ -2,6 +2,7 @@
 """Main entrypoint for the Lightspeed to Dataverse exporter."""
 
 import argparse
+import functools
 import logging
 import signal
 import sys
@@ -44,8 +45,9 @@ class Args(argparse.Namespace):
 logger = logging.getLogger(__name__)
 
 
-def parse_args() -> Args:
-    """Parse command line arguments with environment selection."""
+@functools.cache
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser once; parsing does not modify it."""
     parser = argparse.ArgumentParser(
         description="Lightspeed to Dataverse data exporter",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
@@ -150,7 +152,12 @@ def parse_args() -> Args:
         help="Print the resolved configuration as JSON and exit without running the service",
     )
 
-    return cast(Args, parser.parse_args())
+    return parser
+
+
+def parse_args() -> Args:
+    """Parse command line arguments with environment selection."""
+    return cast(Args, _build_parser().parse_args())
 
 
 def configure_logging(log_level: str, use_rich: bool = False) -> None:
@@ -222,7 +229,9 @@ def main() -> int:
     if args.config:
         try:
             with open(args.config, "r", encoding="utf-8") as f:
-                config_dict = yaml.safe_load(f) or {}
+                # Prefer the libyaml-backed loader when PyYAML was built with it
+                loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+                config_dict = yaml.load(f, Loader=loader) or {}
         except Exception as e:
             # Can't use logger yet since logging isn't configured
             print(
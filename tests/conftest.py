@@ -13,6 +13,12 @@ def temp_dir():
         yield Path(tmpdir)
 
 
+@pytest.fixture(scope="session")
+def shared_tmpdir(tmp_path_factory):
+    """Create one data directory shared by tests that never write into it."""
+    return tmp_path_factory.mktemp("data")
+
+
 @pytest.fixture
 def sample_json_data():
     """Sample JSON data for testing."""
@@ -4,7 +4,6 @@ import json
 import os
 import subprocess
 import sys
-import tempfile
 from pathlib import Path
 
 import pytest
@@ -96,16 +95,8 @@ def command_args():
 
 @pytest.fixture
 def temp_config_file():
-    """Store temporary config file path and clean up after test."""
-    temp_file_data = {}
-    yield temp_file_data
-
-    # Cleanup: remove temporary file if it was created
-    if "path" in temp_file_data:
-        try:
-            os.unlink(temp_file_data["path"])
-        except FileNotFoundError:
-            pass  # File already deleted, no problem
+    """Store the temporary config file path."""
+    return {}
 
 
 # Given steps
@@ -123,15 +114,13 @@ def set_ingress_auth_token_env(env_vars):
 
 
 @given("I have a config file with content:")
-def create_temp_config_file(temp_config_file, docstring):
+def create_temp_config_file(temp_config_file, docstring, tmp_path):
     """Create a temporary config file with the given content."""
-    # Create a temporary file
-    temp_file = tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False)
-    temp_file.write(docstring)
-    temp_file.close()
+    # tmp_path is per test and removed by pytest, so no cleanup is needed
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(docstring)
 
-    # Store the path for cleanup and use
-    temp_config_file["path"] = temp_file.name
+    temp_config_file["path"] = str(config_path)
 
 
 # When steps
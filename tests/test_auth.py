@@ -1,7 +1,7 @@
 """Tests for src.auth module."""
 
 import base64
-from unittest.mock import Mock, patch
+from unittest.mock import DEFAULT, Mock, patch
 
 import jwt
 import kubernetes
@@ -48,23 +48,28 @@ class TestAuthProvider:
 class TestOpenShiftAuthProvider:
     """Test cases for OpenShiftAuthProvider."""
 
-    @patch("src.auth.providers.openshift.kubernetes.config.load_incluster_config")
-    @patch("src.auth.providers.openshift.kubernetes.client.CoreV1Api")
-    def test_successful_initialization(self, mock_core_v1, mock_load_config):
+    @pytest.fixture
+    def k8s(self):
+        """Patch the in-cluster config loader and the Kubernetes API classes."""
+        with (
+            patch("kubernetes.config.load_incluster_config") as load_config,
+            patch.multiple(
+                "kubernetes.client", CoreV1Api=DEFAULT, CustomObjectsApi=DEFAULT
+            ) as api_classes,
+        ):
+            yield {"load_incluster_config": load_config, **api_classes}
+
+    def test_successful_initialization(self, k8s):
         """Test successful initialization in OpenShift cluster."""
-        mock_client = Mock()
-        mock_core_v1.return_value = mock_client
-
         provider = OpenShiftAuthProvider()
 
-        mock_load_config.assert_called_once()
-        mock_core_v1.assert_called_once()
-        assert provider._k8s_client == mock_client
+        k8s["load_incluster_config"].assert_called_once()
+        k8s["CoreV1Api"].assert_called_once()
+        assert provider._k8s_client == k8s["CoreV1Api"].return_value
 
-    @patch("src.auth.providers.openshift.kubernetes.config.load_incluster_config")
-    def test_initialization_fails_outside_cluster(self, mock_load_config):
+    def test_initialization_fails_outside_cluster(self, k8s):
         """Test initialization fails when not in OpenShift cluster."""
-        mock_load_config.side_effect = kubernetes.config.ConfigException(
+        k8s["load_incluster_config"].side_effect = kubernetes.config.ConfigException(
             "Not in cluster"
         )
 
@@ -73,17 +78,9 @@ class TestOpenShiftAuthProvider:
 
         assert "Not running in OpenShift cluster" in str(exc_info.value)
 
-    @patch("src.auth.providers.openshift.kubernetes.config.load_incluster_config")
-    @patch("src.auth.providers.openshift.kubernetes.client.CoreV1Api")
-    @patch("src.auth.providers.openshift.kubernetes.client.CustomObjectsApi")
-    def test_get_identity_id_success(
-        self, mock_custom_api, mock_core_v1, mock_load_config
-    ):
+    def test_get_identity_id_success(self, k8s):
         """Test successful cluster ID retrieval."""
-        # Setup mocks
-        mock_core_v1.return_value = Mock()
-        mock_custom_client = Mock()
-        mock_custom_api.return_value = mock_custom_client
+        mock_custom_client = k8s["CustomObjectsApi"].return_value
 
         # Mock cluster version response
         cluster_version = {"spec": {"clusterID": "test-cluster-id"}}
@@ -100,16 +97,12 @@ class TestOpenShiftAuthProvider:
             name="version",
         )
 
-    @patch("src.auth.providers.openshift.kubernetes.config.load_incluster_config")
-    @patch("src.auth.providers.openshift.kubernetes.client.CoreV1Api")
-    def test_get_auth_token_key_error(self, mock_core_v1, mock_load_config):
+    def test_get_auth_token_key_error(self, k8s):
         """Test get_auth_token handles KeyError when pull secret is malformed."""
-        mock_client = Mock()
-        mock_core_v1.return_value = mock_client
+        mock_client = k8s["CoreV1Api"].return_value
 
         # Mock secret with missing keys
-        mock_secret = Mock()
-        mock_secret.data = {}  # Missing .dockerconfigjson key
+        mock_secret = Mock(data={})  # Missing .dockerconfigjson key
         mock_client.read_namespaced_secret.return_value = mock_secret
 
         provider = OpenShiftAuthProvider()
@@ -119,17 +112,13 @@ class TestOpenShiftAuthProvider:
 
         assert "Missing required keys in pull secret" in str(exc_info.value)
 
-    @patch("src.auth.providers.openshift.kubernetes.config.load_incluster_config")
-    @patch("src.auth.providers.openshift.kubernetes.client.CoreV1Api")
-    def test_get_auth_token_json_decode_error(self, mock_core_v1, mock_load_config):
+    def test_get_auth_token_json_decode_error(self, k8s):
         """Test get_auth_token handles JSONDecodeError when pull secret data is invalid."""
-        mock_client = Mock()
-        mock_core_v1.return_value = mock_client
+        mock_client = k8s["CoreV1Api"].return_value
 
         # Mock secret with invalid JSON
-        mock_secret = Mock()
         invalid_json = base64.b64encode(b"invalid json").decode("utf-8")
-        mock_secret.data = {".dockerconfigjson": invalid_json}
+        mock_secret = Mock(data={".dockerconfigjson": invalid_json})
         mock_client.read_namespaced_secret.return_value = mock_secret
 
         provider = OpenShiftAuthProvider()
@@ -139,12 +128,9 @@ class TestOpenShiftAuthProvider:
 
         assert "Invalid pull secret format" in str(exc_info.value)
 
-    @patch("src.auth.providers.openshift.kubernetes.config.load_incluster_config")
-    @patch("src.auth.providers.openshift.kubernetes.client.CoreV1Api")
-    def test_get_auth_token_api_exception(self, mock_core_v1, mock_load_config):
+    def test_get_auth_token_api_exception(self, k8s):
         """Test get_auth_token handles Kubernetes API exceptions."""
-        mock_client = Mock()
-        mock_core_v1.return_value = mock_client
+        mock_client = k8s["CoreV1Api"].return_value
 
         # Mock API exception
         api_error = kubernetes.client.exceptions.ApiException(
@@ -160,17 +146,9 @@ class TestOpenShiftAuthProvider:
 
         assert "Cannot access pull secret" in str(exc_info.value)
 
-    @patch("src.auth.providers.openshift.kubernetes.config.load_incluster_config")
-    @patch("src.auth.providers.openshift.kubernetes.client.CoreV1Api")
-    @patch("src.auth.providers.openshift.kubernetes.client.CustomObjectsApi")
-    def test_get_identity_id_key_error(
-        self, mock_custom_api, mock_core_v1, mock_load_config
-    ):
+    def test_get_identity_id_key_error(self, k8s):
         """Test get_identity_id handles KeyError when cluster version is malformed."""
-        mock_client = Mock()
-        mock_core_v1.return_value = mock_client
-        mock_custom_client = Mock()
-        mock_custom_api.return_value = mock_custom_client
+        mock_custom_client = k8s["CustomObjectsApi"].return_value
 
         # Mock cluster version response missing clusterID
         cluster_version = {"spec": {}}  # Missing clusterID
@@ -183,17 +161,9 @@ class TestOpenShiftAuthProvider:
 
         assert "Missing cluster ID in cluster version" in str(exc_info.value)
 
-    @patch("src.auth.providers.openshift.kubernetes.config.load_incluster_config")
-    @patch("src.auth.providers.openshift.kubernetes.client.CoreV1Api")
-    @patch("src.auth.providers.openshift.kubernetes.client.CustomObjectsApi")
-    def test_get_identity_id_api_exception(
-        self, mock_custom_api, mock_core_v1, mock_load_config
-    ):
+    def test_get_identity_id_api_exception(self, k8s):
         """Test get_identity_id handles Kubernetes API exceptions."""
-        mock_client = Mock()
-        mock_core_v1.return_value = mock_client
-        mock_custom_client = Mock()
-        mock_custom_api.return_value = mock_custom_client
+        mock_custom_client = k8s["CustomObjectsApi"].return_value
 
         # Mock API exception
         api_error = kubernetes.client.exceptions.ApiException(
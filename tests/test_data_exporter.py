@@ -1,13 +1,15 @@
 """Tests for src.data_exporter module."""
 
-import tempfile
+import pytest
 from pathlib import Path
-import threading
-import time
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 import io
-import requests
+import tempfile
+from operator import attrgetter
 import tarfile
+import threading
+
+from requests.exceptions import RequestException
 
 from src.data_exporter import (
     DataCollectorService,
@@ -15,393 +17,451 @@ from src.data_exporter import (
 )
 from src.settings import DataCollectorSettings
 
+DEFAULT_CONFIG = {
+    "data_dir": Path(tempfile.gettempdir()),
+    "service_id": "test-service",
+    "ingress_server_url": "https://example.com/api/v1/upload",
+    "ingress_server_auth_token": "test-token",
+    "identity_id": "test-identity",
+    "collection_interval": 60,
+    "ingress_connection_timeout": 30,
+    "cleanup_after_send": True,
+    "allowed_subdirs": [],
+    "retry_interval": 10,
+}
+
+# Validated once at import; tests derive their settings from it
+_BASE_SETTINGS = DataCollectorSettings(**DEFAULT_CONFIG)
+
 
 def create_test_config(**overrides) -> DataCollectorSettings:
     """Create a DataCollectorSettings for testing with default values.
 
+    The overrides are applied with model_copy and are not re-validated, so
+    tests must pass values of the field types (e.g. Path for data_dir).
+
     Args:
         **overrides: Any configuration values to override
 
     Returns:
         DataCollectorSettings with test defaults
     """
-    defaults = {
-        "data_dir": Path("/tmp/test"),
-        "service_id": "test-service",
-        "ingress_server_url": "https://example.com/api/v1/upload",
-        "ingress_server_auth_token": "test-token",
-        "identity_id": "test-identity",
-        "collection_interval": 60,
-        "ingress_connection_timeout": 30,
-        "cleanup_after_send": True,
-        "allowed_subdirs": [],
-        "retry_interval": 10,
-    }
-    defaults.update(overrides)
-    return DataCollectorSettings(**defaults)
+    return _BASE_SETTINGS.model_copy(update=overrides)
 
 
-class TestDataCollectorService:
-    """Test cases for DataCollectorService."""
+def make_service(data_dir: Path, **overrides) -> DataCollectorService:
+    """Create a DataCollectorService for testing with default configuration.
 
-    def test_collect_and_process_no_files(self):
-        """Test that service initializes correctly with all required parameters."""
+    Args:
+        data_dir: Data directory for the service
+        **overrides: Any other configuration values to override
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config = create_test_config(data_dir=Path(tmpdir))
-            service = DataCollectorService(config)
+    Returns:
+        DataCollectorService built from the test defaults
+    """
+    return DataCollectorService(create_test_config(data_dir=data_dir, **overrides))
 
-            # Test that service attributes are set correctly
-            assert service.data_dir == Path(tmpdir)
-            assert service.collection_interval == 60
-            assert service.cleanup_after_send is True
 
-            # Test that config is set correctly
-            assert service.config.service_id == "test-service"
-            assert (
-                service.config.ingress_server_url == "https://example.com/api/v1/upload"
-            )
-            assert service.config.ingress_server_auth_token == "test-token"
-            assert service.config.identity_id == "test-identity"
-            assert service.config.ingress_connection_timeout == 30
-
-    def test_service_initialization(self):
-        """Test DataCollectorService initialization with all parameters."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config = create_test_config(
-                data_dir=Path(tmpdir),
-                identity_id="cluster-123",
-            )
-            service = DataCollectorService(config)
-
-            # Verify all attributes are set correctly
-            assert service.data_dir == Path(tmpdir)
-            assert service.collection_interval == 60
-            assert service.cleanup_after_send is True
-            assert service.config.service_id == "test-service"
-            assert (
-                service.config.ingress_server_url == "https://example.com/api/v1/upload"
-            )
-            assert service.config.ingress_server_auth_token == "test-token"
-            assert service.config.identity_id == "cluster-123"
-            assert service.config.ingress_connection_timeout == 30
-
-    def test_service_initialization_with_different_params(self):
-        """Test DataCollectorService initialization with different parameters."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config = create_test_config(
-                data_dir=Path(tmpdir),
-                service_id="my-service",
-                collection_interval=120,
-                ingress_connection_timeout=60,
-                cleanup_after_send=False,
-            )
-            service = DataCollectorService(config)
-
-            # Verify different parameter values
-            assert service.config.service_id == "my-service"
-            assert service.collection_interval == 120
-            assert service.config.ingress_connection_timeout == 60
-            assert service.cleanup_after_send is False
-
-    def test_service_initialization_with_custom_allowed_subdirs(self):
-        """Test DataCollectorService initialization with custom allowed_subdirs."""
-        custom_subdirs = ["logs", "metrics", "traces"]
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config = create_test_config(
-                data_dir=Path(tmpdir),
-                allowed_subdirs=custom_subdirs,
-            )
-            service = DataCollectorService(config)
+def _tar_names(tarball: io.BytesIO) -> list[str]:
+    """Return member names of a tarball in a single forward pass.
 
-            # Verify allowed_subdirs is set correctly
-            assert service.config.allowed_subdirs == custom_subdirs
-            # Verify file_handler gets the custom subdirs
-            assert service.file_handler.allowed_subdirs == custom_subdirs
+    Args:
+        tarball: BytesIO object holding the tarball
+
+    Returns:
+        Names of the archive members in archive order
+    """
+    tarball.seek(0)
+    with tarfile.open(fileobj=tarball, mode="r|*") as tar:
+        return [member.name for member in tar]
+
+
+@pytest.fixture(scope="class")
+def tarball_payloads(fs_class):
+    """Lay out the in-memory payload directories once per test class.
+
+    Returns:
+        Dictionary mapping payload variant (flat, nested, regular) to
+        its directory; the regular one also holds symlink.json, a symlink
+        to regular.json
+    """
+    root = Path("/payloads")
+    files = {
+        "flat/test1.json": b'{"test": "data1"}',
+        "flat/test2.json": b'{"test": "data2"}',
+        "nested/root.json": b'{"test": "root"}',
+        "nested/subdir/nested.json": b'{"test": "nested"}',
+        "regular/regular.json": b'{"test": "data"}',
+    }
+    for relative_path, contents in files.items():
+        fs_class.create_file(root / relative_path, contents=contents)
+    # The fake filesystem allows symlinks without extra privileges
+    fs_class.create_symlink(
+        root / "regular" / "symlink.json", root / "regular" / "regular.json"
+    )
+
+    return {name: root / name for name in ("flat", "nested", "regular")}
+
+
+class TestDataCollectorService:
+    """Test cases for DataCollectorService."""
+
+    @pytest.mark.parametrize(
+        "overrides,expected",
+        [
+            pytest.param(
+                {},
+                {
+                    "collection_interval": 60,
+                    "cleanup_after_send": True,
+                    "config.service_id": "test-service",
+                    "config.ingress_server_url": "https://example.com/api/v1/upload",
+                    "config.ingress_server_auth_token": "test-token",
+                    "config.identity_id": "test-identity",
+                    "config.ingress_connection_timeout": 30,
+                },
+                id="defaults",
+            ),
+            pytest.param(
+                {"identity_id": "cluster-123"},
+                {"config.identity_id": "cluster-123"},
+                id="identity_id",
+            ),
+            pytest.param(
+                {
+                    "service_id": "my-service",
+                    "collection_interval": 120,
+                    "ingress_connection_timeout": 60,
+                    "cleanup_after_send": False,
+                },
+                {
+                    "config.service_id": "my-service",
+                    "collection_interval": 120,
+                    "config.ingress_connection_timeout": 60,
+                    "cleanup_after_send": False,
+                },
+                id="different_params",
+            ),
+            pytest.param(
+                {"allowed_subdirs": ["logs", "metrics", "traces"]},
+                {
+                    "config.allowed_subdirs": ["logs", "metrics", "traces"],
+                    # file_handler gets the custom subdirs
+                    "file_handler.allowed_subdirs": frozenset(
+                        {"logs", "metrics", "traces"}
+                    ),
+                },
+                id="custom_allowed_subdirs",
+            ),
+        ],
+    )
+    def test_service_initialization(self, overrides, expected, shared_tmpdir):
+        """Test DataCollectorService initialization with various parameters."""
+        service = make_service(shared_tmpdir, **overrides)
+
+        assert service.data_dir == shared_tmpdir
+        for attribute, value in expected.items():
+            assert attrgetter(attribute)(service) == value, attribute
+
+    @patch("src.data_exporter.IngressClient")
+    def test_ingress_client_created_on_first_use(self, mock_client, shared_tmpdir):
+        """Test that the ingress client is only built when first accessed."""
+        service = make_service(shared_tmpdir)
+        mock_client.assert_not_called()
+
+        assert service.ingress_client is service.ingress_client
+        mock_client.assert_called_once_with(
+            ingress_server_url="https://example.com/api/v1/upload",
+            ingress_server_auth_token="test-token",
+            service_id="test-service",
+            identity_id="test-identity",
+            connection_timeout=30,
+        )
 
 
 class TestPackageFilesIntoTarball:
     """Test cases for package_files_into_tarball function."""
 
-    def test_package_files_into_tarball_success(self):
-        """Test successful tarball creation."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create test files
-            test_dir = Path(tmpdir)
-            file1 = test_dir / "test1.json"
-            file2 = test_dir / "test2.json"
-            file1.write_text('{"test": "data1"}')
-            file2.write_text('{"test": "data2"}')
-
-            file_paths = [file1, file2]
-            result = package_files_into_tarball(file_paths, tmpdir)
-
-            # Should return BytesIO object
-            assert isinstance(result, io.BytesIO)
-
-            # Verify tarball contents
-            result.seek(0)
-            with tarfile.open(fileobj=result, mode="r:gz") as tar:
-                members = tar.getnames()
-                assert len(members) == 2
-                assert "test1.json" in members
-                assert "test2.json" in members
-
-    def test_package_files_into_tarball_with_subdirectories(self):
-        """Test tarball creation with files in subdirectories."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create test files in subdirectories
-            test_dir = Path(tmpdir)
-            subdir = test_dir / "subdir"
-            subdir.mkdir()
-            file1 = test_dir / "root.json"
-            file2 = subdir / "nested.json"
-            file1.write_text('{"test": "root"}')
-            file2.write_text('{"test": "nested"}')
-
-            file_paths = [file1, file2]
-            result = package_files_into_tarball(file_paths, tmpdir)
-
-            # Verify tarball contents preserve directory structure
-            result.seek(0)
-            with tarfile.open(fileobj=result, mode="r:gz") as tar:
-                members = tar.getnames()
-                assert "root.json" in members
-                assert "subdir/nested.json" in members
-
-    def test_package_files_into_tarball_skips_symlinks(self):
-        """Test that symlinks are skipped during tarball creation."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            test_dir = Path(tmpdir)
-            # Create regular file
-            regular_file = test_dir / "regular.json"
-            regular_file.write_text('{"test": "data"}')
+    def test_package_files_into_tarball_success(self, tarball_payloads):
+        """Test successful tarball creation from flat files."""
+        test_dir = tarball_payloads["flat"]
+        file_paths = [test_dir / "test1.json", test_dir / "test2.json"]
+        result = package_files_into_tarball(file_paths, test_dir.as_posix())
 
-            # Create symlink
-            symlink_file = test_dir / "symlink.json"
-            symlink_file.symlink_to(regular_file)
+        # Should return a gzipped tarball in a BytesIO object
+        assert isinstance(result, io.BytesIO)
+        assert result.getvalue()[:2] == b"\x1f\x8b"
 
-            file_paths = [regular_file, symlink_file]
-            result = package_files_into_tarball(file_paths, tmpdir)
+        # Verify tarball contents
+        members = _tar_names(result)
+        assert len(members) == 2
+        assert "test1.json" in members
+        assert "test2.json" in members
 
-            # Verify only regular file is included
-            result.seek(0)
-            with tarfile.open(fileobj=result, mode="r:gz") as tar:
-                members = tar.getnames()
-                assert "regular.json" in members
-                assert "symlink.json" not in members  # Symlink should be skipped
+    def test_package_files_into_tarball_with_subdirectories(self, tarball_payloads):
+        """Test tarball creation with files in subdirectories."""
+        test_dir = tarball_payloads["nested"]
+        file_paths = [test_dir / "root.json", test_dir / "subdir" / "nested.json"]
+        result = package_files_into_tarball(file_paths, test_dir.as_posix())
 
+        # Verify tarball contents preserve directory structure
+        members = _tar_names(result)
+        assert "root.json" in members
+        assert "subdir/nested.json" in members
 
-def stop_service(service: DataCollectorService):
-    # Small delay to allow service to process at least one iteration
-    time.sleep(0.1)
-    service.shutdown()
+    def test_package_files_into_tarball_skips_symlinks(self, tarball_payloads):
+        """Test that symlinks are skipped during tarball creation."""
+        test_dir = tarball_payloads["regular"]
+        file_paths = [test_dir / "regular.json", test_dir / "symlink.json"]
+        result = package_files_into_tarball(file_paths, test_dir.as_posix())
+
+        # Verify only regular file is included
+        assert _tar_names(result) == ["regular.json"]
 
 
 class TestDataCollectorServiceRun:
     """Test cases for DataCollectorService.run method."""
 
+    @pytest.fixture(autouse=True)
+    def _no_network(self, monkeypatch):
+        """Keep run tests from uploading anything to the ingress server."""
+        monkeypatch.setattr(
+            "src.data_exporter.IngressClient.upload_tarball", lambda *a, **k: None
+        )
+
     @patch("src.file_handler.FileHandler.collect_files")
     @patch("src.file_handler.FileHandler.gather_data_chunks")
-    def test_run_no_data_found(self, mock_gather, mock_collect):
+    def test_run_no_data_found(self, mock_gather, mock_collect, shared_tmpdir):
         """Test run method when no data is found."""
         mock_collect.return_value = []
         mock_gather.return_value = []
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config = create_test_config(data_dir=Path(tmpdir))
-            service = DataCollectorService(config)
+        service = make_service(shared_tmpdir)
 
-            threading.Thread(target=stop_service, args=[service]).start()
+        # Report shutdown as soon as the loop waits for the next cycle
+        with patch.object(service.shutdown_event, "wait", return_value=True):
             service.run()
 
-            mock_collect.assert_called()
-            mock_gather.assert_called_with([])
+        # One regular cycle plus the final collection before shutdown
+        assert mock_collect.call_count == 2
+        mock_gather.assert_called_with([])
 
     @patch("src.file_handler.FileHandler.collect_files")
     @patch("src.file_handler.FileHandler.gather_data_chunks")
-    def test_run_single_shot_mode(self, mock_gather, mock_collect):
-        """Test run method when no data is found."""
-        mock_collect.return_value = []
+    def test_run_stops_on_shutdown_from_another_thread(
+        self, mock_gather, mock_collect, shared_tmpdir
+    ):
+        """Test that shutdown() called from another thread stops the loop."""
+        started = threading.Event()
+
+        def collect_side_effect():
+            started.set()
+            return []
+
+        mock_collect.side_effect = collect_side_effect
         mock_gather.return_value = []
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config = create_test_config(data_dir=Path(tmpdir), collection_interval=0)
-            service = DataCollectorService(config)
+        service = make_service(shared_tmpdir)
 
-            service.run()
+        def stop_service():
+            # Wait for the first collection instead of sleeping
+            started.wait(timeout=1)
+            service.shutdown()
 
-            mock_collect.assert_called()
-            mock_gather.assert_called_with([])
+        stopper = threading.Thread(target=stop_service)
+        stopper.start()
+        service.run()
+        stopper.join()
+
+        # One regular cycle plus the final collection before shutdown
+        assert mock_collect.call_count == 2
 
     @patch("src.file_handler.FileHandler.collect_files")
     @patch("src.file_handler.FileHandler.gather_data_chunks")
-    @patch("src.data_exporter.package_files_into_tarball")
-    @patch("src.file_handler.FileHandler.delete_collected_files")
-    @patch("src.file_handler.FileHandler.ensure_size_limit")
-    def test_run_with_data_cleanup_enabled(
-        self,
-        mock_ensure,
-        mock_delete,
-        mock_package,
-        mock_gather,
-        mock_collect,
-    ):
-        """Test run method with data and cleanup enabled."""
-        # Setup mocks
-        mock_files = [(Path("/test/file1.json"), 100)]
-        mock_collect.return_value = mock_files
-        mock_chunks = [[Path("/test/file1.json")]]
-        mock_gather.return_value = mock_chunks
-        mock_package.return_value = io.BytesIO(b"tarball data")
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config = create_test_config(data_dir=Path(tmpdir))
-            service = DataCollectorService(config)
-
-            with patch.object(service.ingress_client, "upload_tarball"):
-                threading.Thread(target=stop_service, args=[service]).start()
-                service.run()
-
-            # Verify data processing workflow
-            mock_collect.assert_called()
-            mock_gather.assert_called_with(mock_files)
-            mock_package.assert_called()
-            mock_delete.assert_called_with([Path("/test/file1.json")])
+    def test_run_single_shot_mode(self, mock_gather, mock_collect, shared_tmpdir):
+        """Test run method when no data is found."""
+        mock_collect.return_value = []
+        mock_gather.return_value = []
+
+        service = make_service(shared_tmpdir, collection_interval=0)
+
+        service.run()
+
+        mock_collect.assert_called()
+        mock_gather.assert_called_with([])
+
+    def test_run_exports_files_past_size_limit(self, fs, monkeypatch):
+        """Test that files past the data directory limit are still exported."""
+        data_dir = Path("/data")
+        file_names = {f"file{i}.json" for i in range(4)}
+        for file_name in file_names:
+            fs.create_file(data_dir / file_name, contents="x" * 10)
+
+        uploaded = []
+        monkeypatch.setattr(
+            "src.data_exporter.IngressClient.upload_tarball",
+            lambda self, tarball: uploaded.extend(_tar_names(tarball)),
+        )
+
+        service = make_service(
+            data_dir, collection_interval=0, cleanup_after_send=False
+        )
+        service.file_handler.max_data_dir_size = 10
+
+        service.run()
+
+        assert set(uploaded) == file_names
+
+    @pytest.mark.parametrize("cleanup_after_send", [True, False])
+    def test_run_with_data(self, monkeypatch, cleanup_after_send, shared_tmpdir):
+        """Test run method with data, with cleanup enabled or disabled."""
+        test_file = Path("/test/file1.json")
+        mock_files = [(test_file, 100)]
+        mock_chunks = [[test_file]]
+
+        # Plain stubs where only the return value matters, mocks where calls
+        # are asserted
+        monkeypatch.setattr(
+            "src.file_handler.FileHandler.collect_files", lambda self: mock_files
+        )
+        mock_gather = Mock(return_value=mock_chunks)
+        monkeypatch.setattr(
+            "src.file_handler.FileHandler.gather_data_chunks", mock_gather
+        )
+        mock_package = Mock(side_effect=lambda *a, **k: io.BytesIO(b"tarball data"))
+        monkeypatch.setattr(
+            "src.data_exporter.package_files_into_tarball", mock_package
+        )
+        mock_delete = Mock()
+        monkeypatch.setattr(
+            "src.file_handler.FileHandler.delete_collected_files", mock_delete
+        )
+        mock_ensure = Mock()
+        monkeypatch.setattr(
+            "src.file_handler.FileHandler.ensure_size_limit", mock_ensure
+        )
+
+        service = make_service(shared_tmpdir, cleanup_after_send=cleanup_after_send)
+        monkeypatch.setattr(service.shutdown_event, "wait", lambda timeout=None: True)
+
+        service.run()
+
+        # Verify data processing workflow
+        mock_gather.assert_called_with(mock_files)
+        mock_package.assert_called()
+
+        if cleanup_after_send:
+            mock_delete.assert_called_with([test_file])
             mock_ensure.assert_called_with(mock_files)
+        else:
+            mock_delete.assert_not_called()
+            mock_ensure.assert_not_called()
 
+    @pytest.mark.parametrize("collection_interval", [0, 60])
+    @patch("src.data_exporter.IngressClient")
     @patch("src.file_handler.FileHandler.collect_files")
-    @patch("src.file_handler.FileHandler.gather_data_chunks")
-    @patch("src.data_exporter.package_files_into_tarball")
-    @patch("src.file_handler.FileHandler.delete_collected_files")
-    @patch("src.file_handler.FileHandler.ensure_size_limit")
-    def test_run_with_data_cleanup_disabled(
-        self,
-        mock_ensure,
-        mock_delete,
-        mock_package,
-        mock_gather,
-        mock_collect,
+    def test_run_closes_ingress_client(
+        self, mock_collect, mock_client, collection_interval, shared_tmpdir
     ):
-        """Test run method with data but cleanup disabled."""
-        # Setup mocks
-        mock_files = [(Path("/test/file1.json"), 100)]
-        mock_collect.return_value = mock_files
-        mock_chunks = [[Path("/test/file1.json")]]
-        mock_gather.return_value = mock_chunks
-        mock_package.return_value = io.BytesIO(b"tarball data")
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config = create_test_config(data_dir=Path(tmpdir), cleanup_after_send=False)
-            service = DataCollectorService(config)
-
-            with patch.object(service.ingress_client, "upload_tarball"):
-                threading.Thread(target=stop_service, args=[service]).start()
-                service.run()
-
-            # Verify cleanup functions are not called
-            mock_delete.assert_not_called()
-            mock_ensure.assert_not_called()
+        """Test that run closes the ingress client once the service stops."""
+        mock_collect.return_value = []
+
+        service = make_service(shared_tmpdir, collection_interval=collection_interval)
+        # Create the client as an upload would
+        assert service.ingress_client is mock_client.return_value
+
+        service.run(max_iterations=1)
+
+        mock_client.return_value.close.assert_called_once()
+        assert "ingress_client" not in service.__dict__
+
+    @pytest.mark.parametrize("max_iterations", [0, -1])
+    @patch("src.file_handler.FileHandler.collect_files")
+    def test_run_rejects_invalid_max_iterations(
+        self, mock_collect, max_iterations, shared_tmpdir
+    ):
+        """Test that run refuses a bound of less than one collection cycle."""
+        service = make_service(shared_tmpdir)
+
+        with pytest.raises(ValueError, match="max_iterations must be at least 1"):
+            service.run(max_iterations=max_iterations)
+
+        mock_collect.assert_not_called()
 
     @patch("src.file_handler.FileHandler.collect_files")
     @patch("src.data_exporter.logger")
-    def test_run_handles_os_error(self, mock_logger, mock_collect):
+    def test_run_handles_os_error(self, mock_logger, mock_collect, shared_tmpdir):
         """Test run method handles OSError gracefully."""
-        # Mock collect_files to raise OSError
-        mock_collect.side_effect = [OSError("File system error"), KeyboardInterrupt()]
+        mock_collect.side_effect = OSError("File system error")
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config = create_test_config(data_dir=Path(tmpdir))
-            service = DataCollectorService(config)
+        service = make_service(shared_tmpdir)
 
-            threading.Thread(target=stop_service, args=[service]).start()
-            service.run()
+        service.run(max_iterations=1)
+
+        # Bounded run should neither retry nor perform a final collection
+        mock_collect.assert_called_once()
 
-            # Should log error and retry
-            mock_logger.error.assert_called()
-            error_call = mock_logger.error.call_args[0]
-            assert "Error during data collection" in error_call[0]
+        # Should log error
+        mock_logger.error.assert_called()
+        error_call = mock_logger.error.call_args[0]
+        assert "Error during data collection" in error_call[0]
 
     @patch("src.file_handler.FileHandler.collect_files")
     @patch("src.data_exporter.logger")
-    def test_run_handles_request_exception(self, mock_logger, mock_collect):
+    def test_run_handles_request_exception(
+        self, mock_logger, mock_collect, shared_tmpdir
+    ):
         """Test run method handles RequestException gracefully."""
-        # Mock to raise RequestException first, then KeyboardInterrupt to exit
-        mock_collect.side_effect = [
-            requests.RequestException("Network error"),
-            KeyboardInterrupt(),
-        ]
+        mock_collect.side_effect = RequestException("Network error")
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config = create_test_config(data_dir=Path(tmpdir))
-            service = DataCollectorService(config)
+        service = make_service(shared_tmpdir)
 
-            threading.Thread(target=stop_service, args=[service]).start()
-            service.run()
+        service.run(max_iterations=1)
+
+        mock_collect.assert_called_once()
 
-            # Should log error about the exception
-            mock_logger.error.assert_called()
-            error_call = mock_logger.error.call_args[0]
-            assert "Error during data collection" in error_call[0]
+        # Should log error about the exception
+        mock_logger.error.assert_called()
+        error_call = mock_logger.error.call_args[0]
+        assert "Error during data collection" in error_call[0]
 
     @patch("src.file_handler.FileHandler.collect_files")
-    def test_run_handles_request_exception_in_single_shot_mode(self, mock_collect):
-        """Test run method handles RequestException gracefully."""
-        # Mock to raise RequestException first, then KeyboardInterrupt to exit
-        mock_collect.side_effect = [
-            requests.RequestException("Network error"),
-        ]
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config = create_test_config(data_dir=Path(tmpdir), collection_interval=0)
-            service = DataCollectorService(config)
-
-            try:
-                service.run()
-            except requests.RequestException:
-                pass
-            else:
-                assert (
-                    False
-                ), "service should have reraised exception when in single shot mode"
+    def test_run_handles_request_exception_in_single_shot_mode(
+        self, mock_collect, shared_tmpdir
+    ):
+        """Test run method reraises RequestException in single-shot mode."""
+        mock_collect.side_effect = RequestException("Network error")
+
+        service = make_service(shared_tmpdir, collection_interval=0)
+
+        # Service should reraise the exception when in single shot mode
+        with pytest.raises(RequestException):
+            service.run()
 
     @patch("src.file_handler.FileHandler.collect_files")
     @patch("src.data_exporter.logger")
-    def test_retry_uses_correct_interval(self, mock_logger, mock_collect):
+    def test_retry_uses_correct_interval(
+        self, mock_logger, mock_collect, shared_tmpdir
+    ):
         """Test that retry logic uses configurable retry_interval."""
-        # Mock collect_files to raise an exception on first call, then KeyboardInterrupt
-        call_count = 0
-
-        def mock_collect_side_effect():
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                raise requests.RequestException("Network error")
-            else:
-                raise KeyboardInterrupt()  # Exit the loop on subsequent calls
-
-        mock_collect.side_effect = mock_collect_side_effect
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Test with a custom retry interval to ensure config is used
-            custom_retry_interval = 120
-            config = create_test_config(
-                data_dir=Path(tmpdir), retry_interval=custom_retry_interval
+        # Fail the first collection, then succeed on the retry
+        mock_collect.side_effect = [RequestException("Network error"), []]
+
+        # Test with a custom retry interval to ensure config is used
+        custom_retry_interval = 120
+        service = make_service(shared_tmpdir, retry_interval=custom_retry_interval)
+
+        # Mock the shutdown_event.wait method to capture the retry interval
+        with patch.object(
+            service.shutdown_event, "wait", return_value=False
+        ) as mock_wait:
+            # The retry is the second and last cycle, so the loop exits cleanly
+            service.run(max_iterations=2)
+
+            # Verify that wait was called with the correct retry interval
+            mock_wait.assert_called_once_with(custom_retry_interval)
+
+            # Verify the log message includes the correct interval
+            mock_logger.info.assert_any_call(
+                "Retrying data collection in %d seconds...", custom_retry_interval
             )
-            service = DataCollectorService(config)
-
-            # Mock the shutdown_event.wait method to capture the retry interval
-            with patch.object(service.shutdown_event, "wait") as mock_wait:
-                # First call returns False (not set), second call can return True or raise KeyboardInterrupt
-                mock_wait.side_effect = [False, KeyboardInterrupt()]
-
-                service.run()
-
-                # Verify that wait was called with the correct retry interval
-                mock_wait.assert_called_with(custom_retry_interval)
-
-                # Verify the log message includes the correct interval
-                mock_logger.info.assert_any_call(
-                    "Retrying data collection in %d seconds...", custom_retry_interval
-                )
@@ -2,35 +2,48 @@
 
 import pytest
 import tempfile
-import shutil
 from pathlib import Path
-from unittest.mock import patch, call
+from unittest.mock import call, patch
 import logging
+import os
 
 from src.file_handler import FileHandler, delete_files, chunk_data, filter_symlinks
 from src.constants import MAX_PAYLOAD_SIZE, MAX_DATA_DIR_SIZE
 
+ALLOWED_SUBDIRS = frozenset({"feedback", "transcripts"})
+
+
+def _symlinks_supported() -> bool:
+    """Check once whether this platform lets us create symlinks."""
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            Path(tmp, "link").symlink_to(Path(tmp, "target"))
+        except OSError:
+            return False
+    return True
+
+
+requires_symlinks = pytest.mark.skipif(
+    not _symlinks_supported(), reason="Symlinks not supported on this system"
+)
+
 
 class TestDeleteFiles:
     """Tests for the delete_files standalone function."""
 
-    def test_delete_files_success(self, tmp_path):
+    @patch("src.file_handler.os.unlink")
+    def test_delete_files_success(self, mock_unlink):
         """Test successful deletion of files."""
-        # Create test files
-        file1 = tmp_path / "test1.json"
-        file2 = tmp_path / "test2.json"
-        file1.write_text('{"test": 1}')
-        file2.write_text('{"test": 2}')
-
-        assert file1.exists()
-        assert file2.exists()
+        # Patching os.unlink is enough here, no need to touch the filesystem
+        file1 = Path("file1.json")
+        file2 = Path("file2.json")
 
-        # Delete files
         delete_files([file1, file2])
 
-        assert not file1.exists()
-        assert not file2.exists()
+        mock_unlink.assert_has_calls([call(file1), call(file2)], any_order=True)
+        assert mock_unlink.call_count == 2
 
+    @pytest.mark.io
     def test_delete_files_with_missing_file(self, tmp_path, caplog):
         """Test deletion when some files don't exist."""
         file1 = tmp_path / "exists.json"
@@ -41,10 +54,11 @@ class TestDeleteFiles:
             delete_files([file1, file2])
 
         assert not file1.exists()
-        assert "Removing" in caplog.text
+        assert "Removed 1 of 2 files" in caplog.text
         assert "already deleted or does not exist" in caplog.text
 
-    @patch("pathlib.Path.unlink")
+    @pytest.mark.io
+    @patch("src.file_handler.os.unlink")
     def test_delete_files_permission_error(self, mock_unlink, tmp_path, caplog):
         """Test deletion with permission errors."""
         file1 = tmp_path / "test.json"
@@ -65,25 +79,22 @@ class TestDeleteFiles:
         # Should not raise any errors
         delete_files([])
 
+    @patch("src.file_handler.os.unlink")
     @patch("src.file_handler.logger")
-    def test_delete_files_still_exists_after_unlink(self, mock_logger, tmp_path):
-        """Test delete_files when file still exists after unlink (edge case)."""
-        test_file = tmp_path / "test.json"
-        test_file.write_text("{}")
+    def test_delete_files_file_not_found_is_ignored(self, mock_logger, mock_unlink):
+        """Test that a file disappearing before unlink is not an error."""
+        missing_file = Path("missing.json")
+        mock_unlink.side_effect = FileNotFoundError(missing_file)
 
-        # Mock pathlib.Path.unlink to succeed but pathlib.Path.exists to return True
-        with (
-            patch("pathlib.Path.unlink") as mock_unlink,
-            patch("pathlib.Path.exists", return_value=True) as mock_exists,
-        ):
-            delete_files([test_file])
+        delete_files([missing_file])
 
-            mock_unlink.assert_called_once()
-            mock_exists.assert_called_once()
-            mock_logger.error.assert_called_once_with(
-                "Failed to remove '%s'", test_file
-            )
+        mock_unlink.assert_called_once_with(missing_file)
+        mock_logger.error.assert_not_called()
+        mock_logger.debug.assert_any_call(
+            "File '%s' already deleted or does not exist", missing_file
+        )
 
+    @pytest.mark.io
     def test_delete_files_removes_empty_directories(self, tmp_path, caplog):
         """Test that empty directories are removed after file deletion."""
         # Create nested directory structure
@@ -114,6 +125,7 @@ class TestDeleteFiles:
         assert data_dir.exists()
         assert "Removing empty directory" in caplog.text
 
+    @pytest.mark.io
     def test_delete_files_preserves_non_empty_directories(self, tmp_path):
         """Test that non-empty directories are not removed."""
         # Create nested directory structure
@@ -141,6 +153,7 @@ class TestDeleteFiles:
         # Root directory should remain
         assert data_dir.exists()
 
+    @pytest.mark.io
     def test_delete_files_never_removes_root_dir(self, tmp_path):
         """Test that root_dir is never removed even if empty."""
         # Create file directly in root_dir
@@ -157,6 +170,7 @@ class TestDeleteFiles:
         # Root directory should remain even though it's empty
         assert data_dir.exists()
 
+    @pytest.mark.io
     def test_delete_files_stops_at_root_boundary(self, tmp_path):
         """Test that cleanup stops at root_dir boundary."""
         # Create structure with directories outside root
@@ -181,6 +195,7 @@ class TestDeleteFiles:
         # Root directory should remain
         assert data_dir.exists()
 
+    @pytest.mark.io
     def test_delete_files_backward_compatible_no_root_dir(self, tmp_path):
         """Test backward compatibility when root_dir is not provided."""
         # Create nested directory structure
@@ -197,6 +212,7 @@ class TestDeleteFiles:
         # Directory should remain (backward compatible behavior)
         assert subdir.exists()
 
+    @pytest.mark.io
     def test_delete_files_handles_multiple_files_in_different_dirs(self, tmp_path):
         """Test cleanup when deleting multiple files in different directories."""
         data_dir = tmp_path / "data"
@@ -227,6 +243,7 @@ class TestDeleteFiles:
 class TestFilterSymlinks:
     """Tests for the filter_symlinks standalone function."""
 
+    @pytest.mark.io
     def test_filter_symlinks_no_symlinks(self, tmp_path):
         """Test filtering when there are no symlinks."""
         # Create regular files
@@ -241,6 +258,8 @@ class TestFilterSymlinks:
         assert result == files
         assert len(result) == 2
 
+    @pytest.mark.io
+    @requires_symlinks
     def test_filter_symlinks_with_symlinks(self, tmp_path, caplog):
         """Test filtering when symlinks are present."""
         # Create regular file and symlink
@@ -249,10 +268,7 @@ class TestFilterSymlinks:
 
         regular_file.write_text("{}")
 
-        try:
-            symlink_file.symlink_to(regular_file)
-        except OSError:
-            pytest.skip("Symlinks not supported on this system")
+        symlink_file.symlink_to(regular_file)
 
         files = [regular_file, symlink_file]
 
@@ -270,6 +286,8 @@ class TestFilterSymlinks:
         result = filter_symlinks([])
         assert result == []
 
+    @pytest.mark.io
+    @requires_symlinks
     def test_filter_symlinks_all_symlinks(self, tmp_path, caplog):
         """Test filtering when all files are symlinks."""
         # Create target file and symlinks
@@ -279,11 +297,8 @@ class TestFilterSymlinks:
 
         target_file.write_text("{}")
 
-        try:
-            symlink1.symlink_to(target_file)
-            symlink2.symlink_to(target_file)
-        except OSError:
-            pytest.skip("Symlinks not supported on this system")
+        symlink1.symlink_to(target_file)
+        symlink2.symlink_to(target_file)
 
         files = [symlink1, symlink2]
 
@@ -298,116 +313,95 @@ class TestFilterSymlinks:
 class TestChunkData:
     """Tests for the chunk_data standalone function."""
 
-    def test_chunk_data_basic(self):
-        """Test basic chunking functionality."""
-        files = [
-            (Path("file1.json"), 30),
-            (Path("file2.json"), 40),
-            (Path("file3.json"), 50),
-        ]
-
-        chunks = chunk_data(files, chunk_max_size=80)
+    @pytest.mark.parametrize(
+        "file_sizes,chunk_max_size,expected_chunks",
+        [
+            pytest.param([30, 40, 50], 80, [[2, 0], [1]], id="basic"),
+            pytest.param([20, 30], 100, [[1, 0]], id="single_chunk"),
+            pytest.param([60, 70], 80, [[1], [0]], id="one_file_per_chunk"),
+            pytest.param([], 100, [], id="empty_list"),
+            pytest.param([50, 50], 100, [[0, 1]], id="exact_size_match"),
+            pytest.param([10, 20], 0, [], id="zero_chunk_size"),
+            pytest.param([0, 10, 0], 0, [[0, 2]], id="zero_chunk_size_empty_files"),
+            # Next-fit would need three chunks here: [50], [60, 40], [50]
+            pytest.param(
+                [50, 60, 40, 50], 100, [[1, 2], [0, 3]], id="best_fit_decreasing"
+            ),
+        ],
+    )
+    def test_chunk_data(self, file_sizes, chunk_max_size, expected_chunks):
+        """Test chunking files of the given sizes.
+
+        expected_chunks lists, for each chunk, the indexes of the files it holds.
+        """
+        files = [(Path(f"file{i + 1}.json"), size) for i, size in enumerate(file_sizes)]
+
+        chunks = chunk_data(files, chunk_max_size=chunk_max_size)
+
+        assert chunks == [[files[i][0] for i in chunk] for chunk in expected_chunks]
+
+    def test_chunk_data_oversized_dropped(self, caplog):
+        """Test that files larger than a chunk are left out with a warning."""
+        oversized = (Path("oversized.json"), 120)
+        regular = (Path("regular.json"), 30)
 
-        assert len(chunks) == 2
-        assert len(chunks[0]) == 2  # file1 + file2 = 70 bytes
-        assert len(chunks[1]) == 1  # file3 = 50 bytes
-        assert chunks[0] == [Path("file1.json"), Path("file2.json")]
-        assert chunks[1] == [Path("file3.json")]
-
-    def test_chunk_data_single_chunk(self):
-        """Test when all files fit in one chunk."""
-        files = [
-            (Path("file1.json"), 20),
-            (Path("file2.json"), 30),
-        ]
-
-        chunks = chunk_data(files, chunk_max_size=100)
-
-        assert len(chunks) == 1
-        assert len(chunks[0]) == 2
-        assert chunks[0] == [Path("file1.json"), Path("file2.json")]
-
-    def test_chunk_data_one_file_per_chunk(self):
-        """Test when each file requires its own chunk."""
-        files = [
-            (Path("file1.json"), 60),
-            (Path("file2.json"), 70),
-        ]
-
-        chunks = chunk_data(files, chunk_max_size=80)
-
-        assert len(chunks) == 2
-        assert len(chunks[0]) == 1
-        assert len(chunks[1]) == 1
-
-    def test_chunk_data_empty_list(self):
-        """Test chunking with empty file list."""
-        chunks = chunk_data([], chunk_max_size=100)
-        assert chunks == []
-
-    def test_chunk_data_exact_size_match(self):
-        """Test chunking when files exactly match chunk size."""
-        files = [
-            (Path("file1.json"), 50),
-            (Path("file2.json"), 50),
-        ]
+        with caplog.at_level(logging.WARNING):
+            chunks = chunk_data([oversized, regular], chunk_max_size=100)
 
-        chunks = chunk_data(files, chunk_max_size=100)
-
-        assert len(chunks) == 1
-        assert len(chunks[0]) == 2
+        assert chunks == [[regular[0]]]
+        assert "oversized.json" in caplog.text
+        assert "exceeds the chunk size" in caplog.text
 
 
 class TestFileHandler:
     """Tests for the FileHandler class."""
 
     @pytest.fixture
-    def temp_data_dir(self):
-        """Create a temporary directory for testing."""
-        temp_dir = tempfile.mkdtemp()
-        yield Path(temp_dir)
-        shutil.rmtree(temp_dir)
+    def fake_data_dir(self, fs):
+        """Create an in-memory data directory backed by pyfakefs."""
+        data_dir = Path("/data")
+        fs.create_dir(data_dir)
+        return data_dir
 
     @pytest.fixture
-    def handler(self, temp_data_dir):
+    def handler(self, tmp_path):
         """Create a FileHandler instance for testing."""
-        return FileHandler(temp_data_dir)
+        return FileHandler(tmp_path)
 
-    def test_init_with_defaults(self, temp_data_dir):
+    def test_init_with_defaults(self, tmp_path):
         """Test FileHandler initialization with default values."""
-        handler = FileHandler(temp_data_dir)
+        handler = FileHandler(tmp_path)
 
-        assert handler.data_dir == temp_data_dir
-        assert handler.allowed_subdirs == []
+        assert handler.data_dir == tmp_path
+        assert handler.allowed_subdirs == frozenset()
         assert handler.max_data_dir_size == MAX_DATA_DIR_SIZE
         assert handler.max_payload_size == MAX_PAYLOAD_SIZE
 
-    def test_init_with_custom_values(self, temp_data_dir):
+    def test_init_with_custom_values(self, tmp_path):
         """Test FileHandler initialization with custom values."""
         custom_subdirs = ["custom1", "custom2"]
         handler = FileHandler(
-            temp_data_dir,
+            tmp_path,
             allowed_subdirs=custom_subdirs,
             max_data_dir_size=1000,
             max_payload_size=500,
         )
 
-        assert handler.data_dir == temp_data_dir
-        assert handler.allowed_subdirs == custom_subdirs
+        assert handler.data_dir == tmp_path
+        assert handler.allowed_subdirs == frozenset(custom_subdirs)
         assert handler.max_data_dir_size == 1000
         assert handler.max_payload_size == 500
 
-    def test_filter_allowed_files_success(self, temp_data_dir, caplog):
+    @pytest.mark.io
+    def test_filter_allowed_files_success(self, tmp_path, caplog):
         """Test filtering files from allowed subdirectories."""
         # Create handler with specific allowed subdirs for filtering test
-        handler = FileHandler(
-            temp_data_dir, allowed_subdirs=["feedback", "transcripts"]
-        )
+        handler = FileHandler(tmp_path, allowed_subdirs=ALLOWED_SUBDIRS)
 
         # Create test files in allowed and disallowed directories
-        feedback_dir = temp_data_dir / "feedback"
-        transcripts_dir = temp_data_dir / "transcripts"
-        unknown_dir = temp_data_dir / "unknown"
+        feedback_dir = tmp_path / "feedback"
+        transcripts_dir = tmp_path / "transcripts"
+        unknown_dir = tmp_path / "unknown"
 
         feedback_dir.mkdir()
         transcripts_dir.mkdir()
@@ -432,17 +426,16 @@ class TestFileHandler:
         assert unknown_file not in filtered
         assert "Found 1 unknown files" in caplog.text
 
-    def test_filter_allowed_files_warns_on_unknown_files(self, temp_data_dir, caplog):
+    @pytest.mark.io
+    def test_filter_allowed_files_warns_on_unknown_files(self, tmp_path, caplog):
         """Test that warning is logged when there are unknown files."""
         # Create handler with specific allowed subdirs for filtering test
-        handler = FileHandler(
-            temp_data_dir, allowed_subdirs=["feedback", "transcripts"]
-        )
+        handler = FileHandler(tmp_path, allowed_subdirs=ALLOWED_SUBDIRS)
 
         # Create test files in allowed and unknown directories
-        feedback_dir = temp_data_dir / "feedback"
-        unknown_dir1 = temp_data_dir / "unknown1"
-        unknown_dir2 = temp_data_dir / "unknown2"
+        feedback_dir = tmp_path / "feedback"
+        unknown_dir1 = tmp_path / "unknown1"
+        unknown_dir2 = tmp_path / "unknown2"
 
         feedback_dir.mkdir()
         unknown_dir1.mkdir()
@@ -473,12 +466,10 @@ class TestFileHandler:
         ]
         assert any("Found 2 unknown files" in msg for msg in warning_messages)
 
-    def test_filter_allowed_files_empty_list(self, temp_data_dir, caplog):
+    def test_filter_allowed_files_empty_list(self, tmp_path, caplog):
         """Test filtering with empty file list."""
         # Create handler with specific allowed subdirs for filtering test
-        handler = FileHandler(
-            temp_data_dir, allowed_subdirs=["feedback", "transcripts"]
-        )
+        handler = FileHandler(tmp_path, allowed_subdirs=ALLOWED_SUBDIRS)
         with caplog.at_level(logging.DEBUG):
             filtered = handler.filter_allowed_files([])
 
@@ -486,19 +477,32 @@ class TestFileHandler:
         # Should log debug message when there are no unknown files
         assert "No unknown files found" in caplog.text
 
-    def test_filter_allowed_files_empty_allowed_subdirs(self, temp_data_dir):
+    def test_filter_allowed_files_outside_data_dir(self, caplog):
+        """Test that allowed subdir names outside data_dir are filtered out."""
+        handler = FileHandler(Path("/data"), allowed_subdirs=ALLOWED_SUBDIRS)
+        inside_file = Path("/data/feedback/inside.json")
+        outside_file = Path("/elsewhere/feedback/outside.json")
+
+        with caplog.at_level(logging.WARNING):
+            filtered = handler.filter_allowed_files([inside_file, outside_file])
+
+        assert filtered == [inside_file]
+        assert "Found 1 unknown files" in caplog.text
+
+    @pytest.mark.io
+    def test_filter_allowed_files_empty_allowed_subdirs(self, tmp_path):
         """Test filtering when allowed_subdirs is empty - should allow all files."""
-        handler = FileHandler(temp_data_dir, allowed_subdirs=[])
+        handler = FileHandler(tmp_path, allowed_subdirs=[])
 
         # Create test files in various locations
-        feedback_dir = temp_data_dir / "feedback"
-        unknown_dir = temp_data_dir / "unknown"
+        feedback_dir = tmp_path / "feedback"
+        unknown_dir = tmp_path / "unknown"
         feedback_dir.mkdir()
         unknown_dir.mkdir()
 
         feedback_file = feedback_dir / "test1.json"
         unknown_file = unknown_dir / "test2.json"
-        root_file = temp_data_dir / "root.json"
+        root_file = tmp_path / "root.json"
 
         feedback_file.write_text("{}")
         unknown_file.write_text("{}")
@@ -512,6 +516,8 @@ class TestFileHandler:
         assert feedback_file in filtered
         assert unknown_file in filtered
         assert root_file in filtered
+        # The input list is handed back as-is, without a copy
+        assert filtered is files
 
     def test_collect_files_directory_not_exists(self, caplog):
         """Test collect_files when data directory doesn't exist."""
@@ -524,10 +530,12 @@ class TestFileHandler:
         assert result == []
         assert f"Data directory {non_existent_dir} does not exist" in caplog.text
 
-    def test_collect_files_no_files(self, handler, temp_data_dir, caplog):
+    def test_collect_files_no_files(self, fake_data_dir, caplog):
         """Test collect_files when no JSON files exist."""
+        handler = FileHandler(fake_data_dir)
+
         # Create allowed directory but no files
-        feedback_dir = temp_data_dir / "feedback"
+        feedback_dir = fake_data_dir / "feedback"
         feedback_dir.mkdir()
 
         with caplog.at_level(logging.DEBUG):
@@ -535,10 +543,12 @@ class TestFileHandler:
 
         assert result == []
 
-    def test_collect_files_success(self, handler, temp_data_dir, caplog):
+    def test_collect_files_success(self, fake_data_dir, caplog):
         """Test successful file collection."""
+        handler = FileHandler(fake_data_dir)
+
         # Create test files
-        feedback_dir = temp_data_dir / "feedback"
+        feedback_dir = fake_data_dir / "feedback"
         feedback_dir.mkdir()
 
         file1 = feedback_dir / "test1.json"
@@ -554,14 +564,14 @@ class TestFileHandler:
         assert all(
             isinstance(path, Path) and isinstance(size, int) for path, size in result
         )
-        assert f"Collected 2 files from {temp_data_dir}" in caplog.text
+        assert f"Collected 2 files from {fake_data_dir}" in caplog.text
 
-    def test_collect_files_removes_oversized(self, temp_data_dir, caplog):
+    def test_collect_files_removes_oversized(self, fake_data_dir, caplog):
         """Test that oversized files are removed."""
         # Create handler with small payload size
-        handler = FileHandler(temp_data_dir, max_payload_size=10)
+        handler = FileHandler(fake_data_dir, max_payload_size=10)
 
-        feedback_dir = temp_data_dir / "feedback"
+        feedback_dir = fake_data_dir / "feedback"
         feedback_dir.mkdir()
 
         small_file = feedback_dir / "small.json"
@@ -586,11 +596,12 @@ class TestFileHandler:
         assert "too big for export and was removed" in caplog.text
         assert "Removed oversized file" in caplog.text
 
-    def test_collect_files_skips_symlinks(self, temp_data_dir, caplog):
+    @requires_symlinks
+    def test_collect_files_skips_symlinks(self, fake_data_dir, caplog):
         """Test that symlinks are skipped for security reasons."""
-        handler = FileHandler(temp_data_dir)
+        handler = FileHandler(fake_data_dir)
 
-        feedback_dir = temp_data_dir / "feedback"
+        feedback_dir = fake_data_dir / "feedback"
         feedback_dir.mkdir()
 
         # Create a regular file and a symlink
@@ -600,11 +611,7 @@ class TestFileHandler:
         regular_file.write_text('{"type": "regular"}')
 
         # Create symlink pointing to the regular file
-        try:
-            symlink_file.symlink_to(regular_file)
-        except OSError:
-            # Skip test if symlinks aren't supported (e.g., Windows without privileges)
-            pytest.skip("Symlinks not supported on this system")
+        symlink_file.symlink_to(regular_file)
 
         with caplog.at_level(logging.WARNING):
             result = handler.collect_files()
@@ -615,15 +622,94 @@ class TestFileHandler:
         assert "Skipping symlink" in caplog.text
         assert str(symlink_file) in caplog.text
 
+    @requires_symlinks
+    def test_collect_files_skips_symlinked_directories(self, fake_data_dir, caplog):
+        """Test that symlinked directories are never descended into."""
+        handler = FileHandler(fake_data_dir)
+
+        outside_file = fake_data_dir.parent / "outside" / "secret.json"
+        outside_file.parent.mkdir(parents=True)
+        outside_file.write_text("{}")
+        linked_dir = fake_data_dir / "feedback"
+        linked_dir.symlink_to(outside_file.parent)
+
+        with caplog.at_level(logging.DEBUG):
+            result = handler.collect_files()
+
+        assert result == []
+        # Only JSON symlinks are warned about one by one
+        assert not [r for r in caplog.records if r.levelno >= logging.WARNING]
+        assert "Skipped 1 symlinks and entries" in caplog.text
+
+    def test_collect_files_skips_unknown_subdirs(self, fake_data_dir, caplog):
+        """Test that only allowed subdirectories are walked."""
+        handler = FileHandler(fake_data_dir, allowed_subdirs=ALLOWED_SUBDIRS)
+
+        feedback_file = fake_data_dir / "feedback" / "nested" / "feedback.json"
+        unknown_file = fake_data_dir / "unknown" / "unknown.json"
+        root_file = fake_data_dir / "root.json"
+        for file_path in (feedback_file, unknown_file, root_file):
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text("{}")
+
+        with caplog.at_level(logging.DEBUG):
+            result = handler.collect_files()
+
+        assert result == [(feedback_file, 2)]
+        warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+        assert [r.getMessage() for r in warnings] == [
+            "Skipped 1 unknown files outside allowed subdirectories"
+        ]
+        assert "Skipped 1 symlinks and entries" in caplog.text
+
+    def test_collect_files_skips_unreadable_subdirs(self, fake_data_dir, caplog):
+        """Test that an unreadable subdirectory is skipped, not fatal."""
+        handler = FileHandler(fake_data_dir)
+
+        readable_file = fake_data_dir / "feedback" / "feedback.json"
+        locked_dir = fake_data_dir / "transcripts"
+        for file_path in (readable_file, locked_dir / "transcript.json"):
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text("{}")
+
+        # chmod does not stop root, so fail the listing of that directory
+        real_scandir = os.scandir
+
+        def scandir(path):
+            if path == os.fspath(locked_dir):
+                raise PermissionError(13, "Permission denied", path)
+            return real_scandir(path)
+
+        with (
+            patch("src.file_handler.os.scandir", side_effect=scandir),
+            caplog.at_level(logging.WARNING),
+        ):
+            result = handler.collect_files()
+
+        assert result == [(readable_file, 2)]
+        assert f"Skipping directory '{locked_dir}'" in caplog.text
+
+    def test_collect_files_lists_files_past_size_limit(self, fake_data_dir):
+        """Test that every file is collected even past the data directory limit."""
+        handler = FileHandler(fake_data_dir, max_data_dir_size=10)
+
+        files = {fake_data_dir / f"file{i}.json" for i in range(4)}
+        for file_path in files:
+            file_path.write_text("x" * 10)
+
+        result = handler.collect_files()
+
+        assert {file_path for file_path, _ in result} == files
+
     @patch("src.file_handler.logger")
     def test_collect_files_oversized_file_removal_fails(
-        self, mock_logger, temp_data_dir
+        self, mock_logger, fake_data_dir
     ):
         """Test collect_files when removal of oversized file fails with OSError."""
-        handler = FileHandler(temp_data_dir, max_payload_size=10)
+        handler = FileHandler(fake_data_dir, max_payload_size=10)
 
         # Create an oversized file
-        oversized_file = temp_data_dir / "large.json"
+        oversized_file = fake_data_dir / "large.json"
         large_content = '{"data": "' + "x" * 50 + '"}'  # >10 bytes
         oversized_file.write_text(large_content)
 
@@ -689,12 +775,11 @@ class TestFileHandler:
         # Should pass root_dir parameter
         mock_delete_files.assert_called_once_with(test_files, root_dir=handler.data_dir)
 
-    def test_delete_collected_files_removes_empty_directories(
-        self, handler, temp_data_dir
-    ):
+    @pytest.mark.io
+    def test_delete_collected_files_removes_empty_directories(self, handler, tmp_path):
         """Test that delete_collected_files removes empty directories."""
         # Create nested directory structure
-        subdir1 = temp_data_dir / "subdir1"
+        subdir1 = tmp_path / "subdir1"
         subdir2 = subdir1 / "subdir2"
         subdir2.mkdir(parents=True)
 
@@ -715,7 +800,7 @@ class TestFileHandler:
         assert not subdir2.exists()
         assert not subdir1.exists()
         # Root directory should remain
-        assert temp_data_dir.exists()
+        assert tmp_path.exists()
 
     @patch("src.file_handler.delete_files")
     def test_ensure_size_limit_under_limit(self, mock_delete_files, handler, caplog):
@@ -773,47 +858,43 @@ class TestFileHandler:
             handler.ensure_size_limit(collected_files)
 
         # Should delete first two files (70 bytes removed, bringing total to 20 < 50)
-        expected_calls = [
-            call([Path("file1.json")], root_dir=handler.data_dir),
-            call([Path("file2.json")], root_dir=handler.data_dir),
-        ]
-        mock_delete_files.assert_has_calls(expected_calls)
+        mock_delete_files.assert_called_once_with(
+            [Path("file1.json"), Path("file2.json")], root_dir=handler.data_dir
+        )
 
 
+@pytest.mark.io
 class TestIntegration:
     """Integration tests for FileHandler workflow."""
 
     @pytest.fixture
-    def integration_setup(self):
+    def integration_setup(self, tmp_path_factory):
         """Set up integration test environment."""
-        temp_dir = tempfile.mkdtemp()
-        data_dir = Path(temp_dir)
+        data_dir = tmp_path_factory.mktemp("data", numbered=True)
 
         # Create directory structure
         feedback_dir = data_dir / "feedback"
         transcripts_dir = data_dir / "transcripts"
         unknown_dir = data_dir / "unknown"
 
-        feedback_dir.mkdir()
-        transcripts_dir.mkdir()
-        unknown_dir.mkdir()
+        feedback_dir.mkdir(exist_ok=True)
+        transcripts_dir.mkdir(exist_ok=True)
+        unknown_dir.mkdir(exist_ok=True)
 
-        yield {
+        return {
             "data_dir": data_dir,
             "feedback_dir": feedback_dir,
             "transcripts_dir": transcripts_dir,
             "unknown_dir": unknown_dir,
         }
 
-        shutil.rmtree(temp_dir)
-
     def test_full_workflow(self, integration_setup):
         """Test complete file handling workflow."""
         dirs = integration_setup
         # Create handler with specific allowed subdirs for filtering test
         handler = FileHandler(
             dirs["data_dir"],
-            allowed_subdirs=["feedback", "transcripts"],
+            allowed_subdirs=ALLOWED_SUBDIRS,
             max_payload_size=100,
         )
 
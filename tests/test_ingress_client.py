@@ -12,7 +12,22 @@ class TestIngressClient:
     """Tests for the IngressClient class."""
 
     @pytest.fixture
-    def client(self):
+    def mock_session(self):
+        """Patch requests.Session and return the session the client will use."""
+        with patch("src.ingress_client.requests.Session") as mock_session_class:
+            yield mock_session_class.return_value
+
+    @pytest.fixture
+    def mock_response(self, mock_session):
+        """Accepted upload response returned by every session post."""
+        mock_response = Mock()
+        mock_response.status_code = 202
+        mock_response.json.return_value = {"request_id": "test-123"}
+        mock_session.post.return_value = mock_response
+        return mock_response
+
+    @pytest.fixture
+    def client(self, mock_session):
         """Create an IngressClient instance for testing."""
         return IngressClient(
             ingress_server_url="https://example.com/api/v1/upload",
@@ -22,17 +37,16 @@ class TestIngressClient:
             connection_timeout=30,
         )
 
-    @patch("src.ingress_client.requests.Session")
-    def test_upload_data_to_ingress_success(self, mock_session_class, client):
+    def test_upload_data_to_ingress_success(self, mock_session, mock_response, client):
         """Test successful data upload to ingress server."""
-        # Setup mock response
-        mock_response = Mock()
-        mock_response.status_code = 202
-        mock_response.json.return_value = {"request_id": "test-123"}
+        # Capture the uploaded bytes while the payload view is still alive
+        uploaded = {}
 
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_session_class.return_value.__enter__.return_value = mock_session
+        def post_side_effect(**kwargs):
+            uploaded["data"] = bytes(kwargs["files"]["file"][1])
+            return mock_response
+
+        mock_session.post.side_effect = post_side_effect
 
         tarball = io.BytesIO(b"test data")
         response = client._upload_data_to_ingress(tarball)
@@ -45,47 +59,52 @@ class TestIngressClient:
         assert call_args[1]["url"] == "https://example.com/api/v1/upload"
         assert call_args[1]["timeout"] == 30
 
+        # Check the tarball was sent without copying and the view was released
+        file_name, file_data, content_type = call_args[1]["files"]["file"]
+        assert file_name == "lightspeed-assistant.tgz"
+        assert content_type == "application/vnd.redhat.test-service.periodic+tar"
+        assert isinstance(file_data, memoryview)
+        assert uploaded["data"] == b"test data"
+        # Closing fails with BufferError while a view is still exported
+        tarball.close()
+
         # Check session headers
         expected_headers = {
             "User-Agent": "openshift-lightspeed-operator/user-data-collection cluster/test-identity",
             "Authorization": "Bearer test-token",
         }
-        for key, value in expected_headers.items():
-            assert mock_session.headers[key] == value
+        assert mock_session.headers == expected_headers
 
-    @patch("src.ingress_client.requests.Session")
-    def test_upload_tarball_success(self, mock_session_class, client):
-        """Test successful tarball upload."""
-        # Setup mock response
-        mock_response = Mock()
-        mock_response.status_code = 202
-        mock_response.json.return_value = {"request_id": "test-request-123"}
+    def test_session_reused_across_uploads(self, mock_session, mock_response, client):
+        """Test that consecutive uploads share a single session."""
+        client.upload_tarball(io.BytesIO(b"first"))
+        client.upload_tarball(io.BytesIO(b"second"))
 
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_session_class.return_value.__enter__.return_value = mock_session
+        assert mock_session.post.call_count == 2
+        mock_session.close.assert_not_called()
 
+    def test_close_closes_session(self, mock_session, client):
+        """Test that closing the client closes its session."""
+        client.close()
+
+        mock_session.close.assert_called_once()
+
+    def test_upload_tarball_success(self, mock_session, mock_response, client):
+        """Test successful tarball upload."""
         tarball = io.BytesIO(b"test tarball data")
         request_id = client.upload_tarball(tarball)
 
-        assert request_id == "test-request-123"
+        assert request_id == "test-123"
         mock_session.post.assert_called_once()
 
         # Check that tarball is closed
         assert tarball.closed
 
-    @patch("src.ingress_client.requests.Session")
-    def test_upload_tarball_failure(self, mock_session_class, client):
+    def test_upload_tarball_failure(self, mock_session, mock_response, client):
         """Test tarball upload failure handling."""
-        # Setup mock response for failure
-        mock_response = Mock()
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
 
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_session_class.return_value.__enter__.return_value = mock_session
-
         tarball = io.BytesIO(b"test tarball data")
 
         with pytest.raises(requests.RequestException) as exc_info:
@@ -95,12 +114,9 @@ class TestIngressClient:
         assert "Internal Server Error" in str(exc_info.value)
         mock_session.post.assert_called_once()
 
-    @patch("src.ingress_client.requests.Session")
-    def test_upload_tarball_network_error(self, mock_session_class, client):
+    def test_upload_tarball_network_error(self, mock_session, client):
         """Test tarball upload with network error."""
-        mock_session = Mock()
         mock_session.post.side_effect = requests.ConnectionError("Network error")
-        mock_session_class.return_value.__enter__.return_value = mock_session
 
         tarball = io.BytesIO(b"test tarball data")
 
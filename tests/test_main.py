@@ -1,345 +1,349 @@
 """Tests for src.main module."""
 
+import argparse
+import logging
 import pytest
 from pathlib import Path
-from unittest.mock import Mock, patch, mock_open
+from unittest.mock import MagicMock, Mock, patch, mock_open
 
-from src.main import parse_args, main, configure_logging
+import src.main as main_module
+from src.main import _build_parser, parse_args, main, configure_logging
 from src.settings import DataCollectorSettings
 from src.auth.providers import AuthenticationError
 
+DATA_DIR = Path("/tmp")
+CONFIG_PATH = Path("/config.yaml")
+
+# Parsed CLI arguments for a minimal manual-mode run; tests override fields
+DEFAULT_ARGS = {
+    "mode": "manual",
+    "config": None,
+    "log_level": None,
+    "data_dir": DATA_DIR,
+    "service_id": "test-service",
+    "ingress_server_url": "https://test.example.com",
+    "identity_id": "test-identity",
+    "ingress_server_auth_token": "test-token",
+    "client_id": None,
+    "client_secret": None,
+    "collection_interval": None,
+    "ingress_connection_timeout": None,
+    "no_cleanup": False,
+    "rich_logs": False,
+    "allowed_subdirs": None,
+    "retry_interval": None,
+    "print_config_and_exit": False,
+}
+
 
 class TestParseArgs:
     """Test cases for argument parsing."""
 
-    def test_parse_args_minimal_manual_mode(self):
-        """Test parsing minimal arguments for manual mode."""
-        test_args = [
-            "--data-dir",
-            "/tmp",
-            "--service-id",
-            "test-service",
-            "--ingress-server-url",
-            "https://example.com",
-            "--ingress-server-auth-token",
-            "test-token",
-            "--identity-id",
-            "test-identity",
-        ]
-
-        with patch("sys.argv", ["main.py"] + test_args):
-            args = parse_args()
-
-            assert args.mode == "manual"  # Default
-            assert args.data_dir == Path("/tmp")
-            assert args.service_id == "test-service"
-            assert args.ingress_server_url == "https://example.com"
-            assert args.ingress_server_auth_token == "test-token"
-            assert args.identity_id == "test-identity"
-            assert args.log_level is None  # Default (resolved to INFO in main())
-
-    def test_parse_args_openshift_mode(self):
-        """Test parsing arguments for OpenShift mode."""
-        test_args = [
-            "--mode",
-            "openshift",
-            "--data-dir",
-            "/tmp",
-            "--service-id",
-            "test-service",
-            "--ingress-server-url",
-            "https://example.com",
-        ]
-
-        with patch("sys.argv", ["main.py"] + test_args):
-            args = parse_args()
-
-            assert args.mode == "openshift"
-            assert args.data_dir == Path("/tmp")
-            assert args.service_id == "test-service"
-            assert args.ingress_server_url == "https://example.com"
-
-    def test_parse_args_with_config_file(self):
-        """Test parsing arguments with config file."""
-        test_args = ["--config", "/path/to/config.yaml", "--log-level", "DEBUG"]
-
-        with patch("sys.argv", ["main.py"] + test_args):
-            args = parse_args()
-
-            assert args.config == Path("/path/to/config.yaml")
-            assert args.log_level == "DEBUG"
-
-    def test_parse_args_all_options(self):
-        """Test parsing all possible arguments."""
-        test_args = [
-            "--mode",
-            "manual",
-            "--config",
-            "/path/to/config.yaml",
-            "--data-dir",
-            "/data",
-            "--service-id",
-            "full-service",
-            "--ingress-server-url",
-            "https://full.example.com",
-            "--ingress-server-auth-token",
-            "full-token",
-            "--identity-id",
-            "full-identity",
-            "--collection-interval",
-            "600",
-            "--ingress-connection-timeout",
-            "60",
-            "--no-cleanup",
-            "--log-level",
-            "WARNING",
-        ]
-
-        with patch("sys.argv", ["main.py"] + test_args):
+    @pytest.mark.parametrize(
+        "argv,expected",
+        [
+            pytest.param(
+                (
+                    "--data-dir",
+                    "/tmp",
+                    "--service-id",
+                    "test-service",
+                    "--ingress-server-url",
+                    "https://example.com",
+                    "--ingress-server-auth-token",
+                    "test-token",
+                    "--identity-id",
+                    "test-identity",
+                ),
+                {
+                    "mode": "manual",  # Default
+                    "data_dir": DATA_DIR,
+                    "service_id": "test-service",
+                    "ingress_server_url": "https://example.com",
+                    "ingress_server_auth_token": "test-token",
+                    "identity_id": "test-identity",
+                    "log_level": None,  # Default (resolved to INFO in main())
+                },
+                id="minimal_manual_mode",
+            ),
+            pytest.param(
+                (
+                    "--mode",
+                    "openshift",
+                    "--data-dir",
+                    "/tmp",
+                    "--service-id",
+                    "test-service",
+                    "--ingress-server-url",
+                    "https://example.com",
+                ),
+                {
+                    "mode": "openshift",
+                    "data_dir": DATA_DIR,
+                    "service_id": "test-service",
+                    "ingress_server_url": "https://example.com",
+                },
+                id="openshift_mode",
+            ),
+            pytest.param(
+                ("--config", "/path/to/config.yaml", "--log-level", "DEBUG"),
+                {"config": Path("/path/to/config.yaml"), "log_level": "DEBUG"},
+                id="config_file",
+            ),
+            pytest.param(
+                (
+                    "--mode",
+                    "manual",
+                    "--config",
+                    "/path/to/config.yaml",
+                    "--data-dir",
+                    "/data",
+                    "--service-id",
+                    "full-service",
+                    "--ingress-server-url",
+                    "https://full.example.com",
+                    "--ingress-server-auth-token",
+                    "full-token",
+                    "--identity-id",
+                    "full-identity",
+                    "--collection-interval",
+                    "600",
+                    "--ingress-connection-timeout",
+                    "60",
+                    "--no-cleanup",
+                    "--log-level",
+                    "WARNING",
+                ),
+                {
+                    "mode": "manual",
+                    "config": Path("/path/to/config.yaml"),
+                    "data_dir": Path("/data"),
+                    "service_id": "full-service",
+                    "ingress_server_url": "https://full.example.com",
+                    "ingress_server_auth_token": "full-token",
+                    "identity_id": "full-identity",
+                    "collection_interval": 600,
+                    "ingress_connection_timeout": 60,
+                    "no_cleanup": True,
+                    "log_level": "WARNING",
+                },
+                id="all_options",
+            ),
+            pytest.param(
+                ("--allowed-subdirs", "logs", "metrics"),
+                {"allowed_subdirs": ["logs", "metrics"]},
+                id="allowed_subdirs_with_values",
+            ),
+        ],
+    )
+    def test_parse_args(self, argv, expected):
+        """Test that the given command line parses into the expected values."""
+        with patch("sys.argv", ["main.py", *argv]):
             args = parse_args()
 
-            assert args.mode == "manual"
-            assert args.config == Path("/path/to/config.yaml")
-            assert args.data_dir == Path("/data")
-            assert args.service_id == "full-service"
-            assert args.ingress_server_url == "https://full.example.com"
-            assert args.ingress_server_auth_token == "full-token"
-            assert args.identity_id == "full-identity"
-            assert args.collection_interval == 600
-            assert args.ingress_connection_timeout == 60
-            assert args.no_cleanup is True
-            assert args.log_level == "WARNING"
-
-    def test_parse_args_invalid_mode(self):
-        """Test parsing with invalid authentication mode."""
-        test_args = ["--mode", "invalid-mode"]
-
-        with patch("sys.argv", ["main.py"] + test_args):
-            with pytest.raises(SystemExit):
-                parse_args()
+        assert {name: getattr(args, name) for name in expected} == expected
 
-    def test_parse_args_invalid_log_level(self):
-        """Test parsing with invalid log level."""
-        test_args = ["--log-level", "INVALID"]
+    def test_parser_built_once(self):
+        """Test that repeated parses reuse a single parser."""
+        assert _build_parser() is _build_parser()
 
-        with patch("sys.argv", ["main.py"] + test_args):
-            with pytest.raises(SystemExit):
-                parse_args()
-
-    def test_parse_args_allowed_subdirs_requires_value(self):
-        """Test that --allowed-subdirs requires at least one value when provided."""
-        test_args = ["--allowed-subdirs"]
-
-        with patch("sys.argv", ["main.py"] + test_args):
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            pytest.param(("--mode", "invalid-mode"), id="invalid_mode"),
+            pytest.param(("--log-level", "INVALID"), id="invalid_log_level"),
+            # --allowed-subdirs requires at least one value when provided
+            pytest.param(("--allowed-subdirs",), id="allowed_subdirs_requires_value"),
+        ],
+    )
+    def test_parse_args_rejects_invalid(self, argv):
+        """Test that invalid command lines exit with a usage error."""
+        with patch("sys.argv", ["main.py", *argv]):
             with pytest.raises(SystemExit):
                 parse_args()
 
-    def test_parse_args_allowed_subdirs_with_values(self):
-        """Test parsing --allowed-subdirs with values."""
-        test_args = ["--allowed-subdirs", "logs", "metrics"]
-
-        with patch("sys.argv", ["main.py"] + test_args):
-            args = parse_args()
-
-            assert args.allowed_subdirs == ["logs", "metrics"]
-
 
 class TestConfigureLogging:
     """Test cases for logging configuration."""
 
+    @pytest.mark.parametrize(
+        "level,expected_level",
+        [
+            pytest.param("INFO", logging.INFO, id="info"),
+            pytest.param("DEBUG", logging.DEBUG, id="debug"),
+        ],
+    )
     @patch("src.main.logging.basicConfig")
     @patch("src.main.logging.getLogger")
-    def test_configure_logging_info_level(self, mock_get_logger, mock_basic_config):
-        """Test logging configuration with INFO level."""
-        mock_logger = Mock()
-        mock_get_logger.return_value = mock_logger
-
-        configure_logging("INFO")
+    def test_configure_logging(
+        self, mock_get_logger, mock_basic_config, level, expected_level
+    ):
+        """Test logging configuration with the given level."""
+        configure_logging(level)
 
         mock_basic_config.assert_called_once()
         call_args = mock_basic_config.call_args
-        assert call_args[1]["level"] == 20  # logging.INFO
+        assert call_args[1]["level"] == expected_level
         assert "%(asctime)s" in call_args[1]["format"]
 
         # Check that specific loggers are silenced
         mock_get_logger.assert_any_call("kubernetes")
         mock_get_logger.assert_any_call("urllib3")
 
-    @patch("src.main.logging.basicConfig")
-    @patch("src.main.logging.getLogger")
-    def test_configure_logging_debug_level(self, mock_get_logger, mock_basic_config):
-        """Test logging configuration with DEBUG level."""
-        mock_logger = Mock()
-        mock_get_logger.return_value = mock_logger
-
-        configure_logging("DEBUG")
-
-        mock_basic_config.assert_called_once()
-        call_args = mock_basic_config.call_args
-        assert call_args[1]["level"] == 10  # logging.DEBUG
-
 
+@pytest.mark.integration
 class TestMain:
     """Test cases for main function."""
 
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data="data_dir: /tmp\nservice_id: config-service\ningress_server_url: https://config.example.com\nidentity_id: config-identity\ncollection_interval: 300\ningress_connection_timeout: 30\ncleanup_after_send: true",
-    )
-    @patch("src.main.OpenShiftAuthProvider")
-    @patch("src.main.DataCollectorService")
+    @pytest.fixture(autouse=True)
+    def main_mocks(self, monkeypatch):
+        """Replace the collaborators every main() run goes through."""
+        # Plain MagicMocks on purpose: autospec would introspect the real
+        # classes on every test, and the tests only check calls and results
+        mocks = {
+            name: MagicMock()
+            for name in ("parse_args", "configure_logging", "DataCollectorService")
+        }
+        for name, mock in mocks.items():
+            monkeypatch.setattr(main_module, name, mock)
+        return mocks
+
+    @pytest.fixture
+    def mock_auth_provider(self, monkeypatch):
+        """Replace the OpenShift auth provider class."""
+        mock_auth_provider = MagicMock()
+        monkeypatch.setattr(main_module, "OpenShiftAuthProvider", mock_auth_provider)
+        return mock_auth_provider
+
+    @pytest.fixture
+    def mock_settings_class(self, monkeypatch):
+        """Replace DataCollectorSettings to inspect the values main() resolves."""
+        mock_settings_class = MagicMock()
+        monkeypatch.setattr(main_module, "DataCollectorSettings", mock_settings_class)
+        return mock_settings_class
+
+    @pytest.fixture
+    def env_auth_token(self, monkeypatch):
+        """Provide the ingress auth token through the environment."""
+        monkeypatch.setenv("INGRESS_SERVER_AUTH_TOKEN", "env-token")
+
+    @pytest.fixture
+    def use_config_file(self, monkeypatch):
+        """Return a function that serves the given dict as the parsed config file.
+
+        YAML parsing itself is skipped; main() gets the dict from yaml.load.
+        """
+
+        def _use_config_file(config):
+            mock_open_file = mock_open()
+            monkeypatch.setattr("builtins.open", mock_open_file)
+            monkeypatch.setattr("yaml.load", Mock(return_value=config))
+            return mock_open_file
+
+        return _use_config_file
+
+    @pytest.fixture
+    def mock_service(self, main_mocks):
+        """The DataCollectorService instance main() creates and runs."""
+        return main_mocks["DataCollectorService"].return_value
+
+    @staticmethod
+    def _create_minimal_args(**overrides):
+        """Create parsed args with only required fields and test-specific overrides."""
+        return argparse.Namespace(**(DEFAULT_ARGS | overrides))
+
     def test_main_with_config_file_openshift_mode(
-        self,
-        mock_service_class,
-        mock_auth_provider,
-        mock_open_file,
-        mock_configure_logging,
-        mock_parse_args,
+        self, mock_auth_provider, main_mocks, mock_service, use_config_file
     ):
         """Test main function with config file in OpenShift mode."""
-        # Setup mocks
-        mock_args = Mock()
-        mock_args.mode = "openshift"
-        mock_args.config = Path("/config.yaml")
-        mock_args.log_level = None  # Not specified in CLI
-        mock_args.data_dir = None
-        mock_args.service_id = None
-        mock_args.ingress_server_url = None
-        mock_args.ingress_server_auth_token = None
-        mock_args.identity_id = None
-        mock_args.collection_interval = None
-        mock_args.ingress_connection_timeout = None
-        mock_args.no_cleanup = False
-        mock_args.rich_logs = False
-        mock_args.allowed_subdirs = None
-        mock_args.retry_interval = None
-        mock_args.print_config_and_exit = False
-        mock_parse_args.return_value = mock_args
-
-        mock_provider = Mock()
-        mock_auth_provider.return_value = mock_provider
-        mock_provider.get_credentials.return_value = (
-            "openshift-token",
-            "openshift-identity",
+        mock_open_file = use_config_file(
+            {
+                "data_dir": "/tmp",
+                "service_id": "config-service",
+                "ingress_server_url": "https://config.example.com",
+                "identity_id": "config-identity",
+                "collection_interval": 300,
+                "ingress_connection_timeout": 30,
+                "cleanup_after_send": True,
+            }
+        )
+        main_mocks["parse_args"].return_value = self._create_minimal_args(
+            mode="openshift",
+            config=CONFIG_PATH,
+            data_dir=None,
+            service_id=None,
+            ingress_server_url=None,
+            identity_id=None,
+            ingress_server_auth_token=None,
         )
 
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
+        mock_provider = Mock(
+            **{
+                "get_credentials.return_value": (
+                    "openshift-token",
+                    "openshift-identity",
+                )
+            }
+        )
+        mock_auth_provider.return_value = mock_provider
 
         result = main()
 
         assert result == 0
         # log_level defaults to "INFO" since not in CLI or config
-        mock_configure_logging.assert_called_once_with("INFO", False)
-        mock_open_file.assert_called_once_with(
-            Path("/config.yaml"), "r", encoding="utf-8"
-        )
+        main_mocks["configure_logging"].assert_called_once_with("INFO", False)
+        mock_open_file.assert_called_once_with(CONFIG_PATH, "r", encoding="utf-8")
         mock_provider.get_credentials.assert_called_once()
+        mock_service_class = main_mocks["DataCollectorService"]
         mock_service.run.assert_called_once()
 
         # Verify DataCollectorService was called with DataCollectorSettings
         mock_service_class.assert_called_once()
         created_settings = mock_service_class.call_args[0][0]
         assert isinstance(created_settings, DataCollectorSettings)
-        assert created_settings.data_dir == Path("/tmp")
+        assert created_settings.data_dir == DATA_DIR
         assert created_settings.service_id == "config-service"
         assert created_settings.ingress_server_url == "https://config.example.com"
 
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    @patch("src.main.DataCollectorService")
-    def test_main_without_config_manual_mode(
-        self, mock_service_class, mock_configure_logging, mock_parse_args
-    ):
+    def test_main_without_config_manual_mode(self, main_mocks, mock_service):
         """Test main function without config file in manual mode."""
-        # Setup mocks
-        mock_args = Mock()
-        mock_args.mode = "manual"
-        mock_args.config = None
-        mock_args.log_level = "DEBUG"
-        mock_args.data_dir = Path("/tmp")
-        mock_args.service_id = "test-service"
-        mock_args.ingress_server_url = "https://test.example.com"
-        mock_args.ingress_server_auth_token = "test-token"
-        mock_args.identity_id = "test-identity"
-        mock_args.collection_interval = 600
-        mock_args.ingress_connection_timeout = 60
-        mock_args.no_cleanup = True
-        mock_args.rich_logs = False
-        mock_args.allowed_subdirs = None
-        mock_args.retry_interval = None
-        mock_args.print_config_and_exit = False
-        mock_parse_args.return_value = mock_args
-
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
+        mock_args = self._create_minimal_args(
+            log_level="DEBUG",
+            collection_interval=600,
+            ingress_connection_timeout=60,
+            no_cleanup=True,
+        )
+        main_mocks["parse_args"].return_value = mock_args
 
         result = main()
 
         assert result == 0
 
         # Verify DataCollectorService was called with proper config
+        mock_service_class = main_mocks["DataCollectorService"]
         mock_service_class.assert_called_once()
         created_settings = mock_service_class.call_args[0][0]
         assert isinstance(created_settings, DataCollectorSettings)
-        mock_configure_logging.assert_called_once_with("DEBUG", mock_args.rich_logs)
+        main_mocks["configure_logging"].assert_called_once_with(
+            "DEBUG", mock_args.rich_logs
+        )
         mock_service.run.assert_called_once()
 
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    def test_main_missing_required_args_manual_mode(
-        self, mock_configure_logging, mock_parse_args
-    ):
+    def test_main_missing_required_args_manual_mode(self, main_mocks):
         """Test main function with missing required arguments in manual mode."""
-        mock_args = Mock()
-        mock_args.mode = "manual"
-        mock_args.config = None
-        mock_args.log_level = None
-        mock_args.data_dir = None  # Missing required arg
-        mock_args.service_id = "test-service"
-        mock_args.ingress_server_url = "https://test.example.com"
-        mock_args.ingress_server_auth_token = "test-token"
-        mock_args.identity_id = "test-identity"
-        mock_args.collection_interval = None
-        mock_args.ingress_connection_timeout = None
-        mock_args.no_cleanup = False
-        mock_args.rich_logs = False
-        mock_args.allowed_subdirs = None
-        mock_args.retry_interval = None
-        mock_args.print_config_and_exit = False
-        mock_parse_args.return_value = mock_args
+        main_mocks["parse_args"].return_value = self._create_minimal_args(
+            data_dir=None,  # Missing required arg
+        )
 
         code = main()
 
         assert code == 1
 
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    @patch("src.main.OpenShiftAuthProvider")
-    def test_main_authentication_error(
-        self, mock_auth_provider, mock_configure_logging, mock_parse_args
-    ):
+    def test_main_authentication_error(self, mock_auth_provider, main_mocks):
         """Test main function with authentication error."""
-        mock_args = Mock()
-        mock_args.mode = "openshift"
-        mock_args.config = None
-        mock_args.log_level = None
-        mock_args.data_dir = Path("/tmp")
-        mock_args.service_id = "test-service"
-        mock_args.ingress_server_url = "https://test.example.com"
-        mock_args.ingress_server_auth_token = None
-        mock_args.identity_id = None
-        mock_args.collection_interval = None
-        mock_args.ingress_connection_timeout = None
-        mock_args.no_cleanup = False
-        mock_args.rich_logs = False
-        mock_args.allowed_subdirs = None
-        mock_args.retry_interval = None
-        mock_args.print_config_and_exit = False
-        mock_parse_args.return_value = mock_args
+        main_mocks["parse_args"].return_value = self._create_minimal_args(
+            mode="openshift", identity_id=None, ingress_server_auth_token=None
+        )
 
         mock_auth_provider.get_credentials.side_effect = AuthenticationError(
             "Auth failed"
@@ -349,117 +353,31 @@ class TestMain:
 
         assert result == 1  # Error exit code
 
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    @patch("src.main.DataCollectorService")
-    def test_main_keyboard_interrupt(
-        self, mock_service_class, mock_configure_logging, mock_parse_args
-    ):
+    def test_main_keyboard_interrupt(self, main_mocks, mock_service):
         """Test main function handles KeyboardInterrupt gracefully."""
-        mock_args = Mock()
-        mock_args.mode = "manual"
-        mock_args.config = None
-        mock_args.log_level = None
-        mock_args.data_dir = Path("/tmp")
-        mock_args.service_id = "test-service"
-        mock_args.ingress_server_url = "https://test.example.com"
-        mock_args.ingress_server_auth_token = "test-token"
-        mock_args.identity_id = "test-identity"
-        mock_args.collection_interval = None
-        mock_args.ingress_connection_timeout = None
-        mock_args.no_cleanup = False
-        mock_args.rich_logs = False
-        mock_args.allowed_subdirs = None
-        mock_args.retry_interval = None
-        mock_args.print_config_and_exit = False
-        mock_parse_args.return_value = mock_args
-
-        mock_service = Mock()
+        main_mocks["parse_args"].return_value = self._create_minimal_args()
         mock_service.run.side_effect = KeyboardInterrupt()
-        mock_service_class.return_value = mock_service
 
         result = main()
 
         assert result == 0  # Graceful exit
 
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    @patch("src.main.DataCollectorService")
-    def test_main_unexpected_exception(
-        self, mock_service_class, mock_configure_logging, mock_parse_args
-    ):
+    def test_main_unexpected_exception(self, main_mocks, mock_service):
         """Test main function handles unexpected exceptions."""
-        mock_args = Mock()
-        mock_args.mode = "manual"
-        mock_args.config = None
-        mock_args.log_level = None
-        mock_args.data_dir = Path("/tmp")
-        mock_args.service_id = "test-service"
-        mock_args.ingress_server_url = "https://test.example.com"
-        mock_args.ingress_server_auth_token = "test-token"
-        mock_args.identity_id = "test-identity"
-        mock_args.collection_interval = None
-        mock_args.ingress_connection_timeout = None
-        mock_args.no_cleanup = False
-        mock_args.rich_logs = False
-        mock_args.allowed_subdirs = None
-        mock_args.retry_interval = None
-        mock_args.print_config_and_exit = False
-        mock_parse_args.return_value = mock_args
-
-        mock_service = Mock()
+        main_mocks["parse_args"].return_value = self._create_minimal_args()
         mock_service.run.side_effect = Exception("Unexpected error")
-        mock_service_class.return_value = mock_service
 
         result = main()
 
         assert result == 1  # Error exit code
 
-    def _create_minimal_args(self, **overrides):
-        """Helper to create minimal mock args with only required fields and test-specific overrides."""
-        mock_args = Mock()
-        # Required fields for manual mode
-        mock_args.mode = "manual"
-        mock_args.config = None
-        mock_args.log_level = None
-        mock_args.data_dir = Path("/tmp")
-        mock_args.service_id = "test-service"
-        mock_args.ingress_server_url = "https://test.example.com"
-        mock_args.identity_id = "test-identity"
-        # Minimal optional fields
-        mock_args.ingress_server_auth_token = None
-        mock_args.collection_interval = None
-        mock_args.ingress_connection_timeout = None
-        mock_args.no_cleanup = False
-        mock_args.rich_logs = False
-        mock_args.allowed_subdirs = None
-        mock_args.retry_interval = None
-        mock_args.print_config_and_exit = False
-
-        # Apply any test-specific overrides
-        for key, value in overrides.items():
-            setattr(mock_args, key, value)
-
-        return mock_args
-
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    @patch("src.main.DataCollectorSettings")
-    @patch("src.main.DataCollectorService")
-    @patch.dict("os.environ", {"INGRESS_SERVER_AUTH_TOKEN": "env-token"})
     def test_main_ingress_token_precedence_cli_over_env(
-        self,
-        mock_service_class,
-        mock_settings_class,
-        mock_configure_logging,
-        mock_parse_args,
+        self, mock_settings_class, main_mocks, env_auth_token
     ):
         """Test that CLI arg takes precedence over environment variable for auth token."""
-        mock_args = self._create_minimal_args(ingress_server_auth_token="cli-token")
-        mock_parse_args.return_value = mock_args
-
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
+        main_mocks["parse_args"].return_value = self._create_minimal_args(
+            ingress_server_auth_token="cli-token"
+        )
 
         result = main()
 
@@ -470,26 +388,14 @@ class TestMain:
         call_kwargs = mock_settings_class.call_args[1]
         assert call_kwargs["ingress_server_auth_token"] == "cli-token"
 
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    @patch("src.main.DataCollectorSettings")
-    @patch("src.main.DataCollectorService")
-    @patch.dict("os.environ", {"INGRESS_SERVER_AUTH_TOKEN": "env-token"})
     def test_main_ingress_token_precedence_env_fallback(
-        self,
-        mock_service_class,
-        mock_settings_class,
-        mock_configure_logging,
-        mock_parse_args,
+        self, mock_settings_class, main_mocks, env_auth_token
     ):
         """Test that environment variable is used when CLI arg not provided."""
-        mock_args = (
-            self._create_minimal_args()
-        )  # ingress_server_auth_token defaults to None
-        mock_parse_args.return_value = mock_args
-
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
+        # No CLI token, so the environment variable should be used
+        main_mocks["parse_args"].return_value = self._create_minimal_args(
+            ingress_server_auth_token=None
+        )
 
         result = main()
 
@@ -500,35 +406,27 @@ class TestMain:
         call_kwargs = mock_settings_class.call_args[1]
         assert call_kwargs["ingress_server_auth_token"] == "env-token"
 
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data="data_dir: /tmp\nservice_id: config-service\ningress_server_url: https://config.example.com\ningress_server_auth_token: config-token\nidentity_id: config-identity\ncollection_interval: 300",
-    )
-    @patch("src.main.DataCollectorSettings")
-    @patch("src.main.DataCollectorService")
-    @patch.dict("os.environ", {"INGRESS_SERVER_AUTH_TOKEN": "env-token"})
     def test_main_ingress_token_precedence_env_over_config(
-        self,
-        mock_service_class,
-        mock_settings_class,
-        mock_open_file,
-        mock_configure_logging,
-        mock_parse_args,
+        self, mock_settings_class, main_mocks, use_config_file, env_auth_token
     ):
         """Test that environment variable takes precedence over config file."""
-        mock_args = self._create_minimal_args(
-            config=Path("/config.yaml"),
+        use_config_file(
+            {
+                "data_dir": "/tmp",
+                "service_id": "config-service",
+                "ingress_server_url": "https://config.example.com",
+                "ingress_server_auth_token": "config-token",
+                "identity_id": "config-identity",
+                "collection_interval": 300,
+            }
+        )
+        main_mocks["parse_args"].return_value = self._create_minimal_args(
+            config=CONFIG_PATH,
             data_dir=None,  # Let config provide this
             service_id=None,  # Let config provide this
             ingress_server_url=None,  # Let config provide this
+            ingress_server_auth_token=None,
         )
-        mock_parse_args.return_value = mock_args
-
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
 
         result = main()
 
@@ -539,44 +437,17 @@ class TestMain:
         call_kwargs = mock_settings_class.call_args[1]
         assert call_kwargs["ingress_server_auth_token"] == "env-token"
 
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    @patch("src.main.DataCollectorService")
-    @patch.dict("os.environ", {"INGRESS_SERVER_AUTH_TOKEN": "env-token"})
-    def test_main_config_defaults(
-        self,
-        mock_service_class,
-        mock_configure_logging,
-        mock_parse_args,
-    ):
+    def test_main_config_defaults(self, main_mocks, env_auth_token):
         """Test that config defaults take effect when not specified in other sources."""
-        mock_args = Mock()
-        # Required fields for manual mode
-        mock_args.mode = "manual"
-        mock_args.config = None
-        mock_args.log_level = None
-        mock_args.data_dir = Path("/tmp")
-        mock_args.service_id = "test-service"
-        mock_args.ingress_server_url = "https://test.example.com"
-        # Minimal optional fields
-        mock_args.identity_id = None
-        mock_args.ingress_server_auth_token = "test-token"
-        mock_args.collection_interval = None
-        mock_args.ingress_connection_timeout = None
-        mock_args.no_cleanup = False
-        mock_args.rich_logs = False
-        mock_args.allowed_subdirs = None
-        mock_args.retry_interval = None
-        mock_args.print_config_and_exit = False
-        mock_parse_args.return_value = mock_args
-
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
+        main_mocks["parse_args"].return_value = self._create_minimal_args(
+            identity_id=None,
+        )
 
         result = main()
 
         assert result == 0
 
+        mock_service_class = main_mocks["DataCollectorService"]
         mock_service_class.assert_called_once()
         settings = mock_service_class.call_args[0][0]
 
@@ -588,109 +459,85 @@ class TestMain:
         assert settings.retry_interval == 300  # Default from constants
         assert settings.allowed_subdirs == []  # Default: collect everything
 
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data="data_dir: /tmp\nservice_id: config-service\ningress_server_url: https://config.example.com\nlog_level: DEBUG\nrich_logs: true",
-    )
-    @patch("src.main.DataCollectorService")
     def test_main_logging_from_config_file(
-        self,
-        mock_service_class,
-        mock_open_file,
-        mock_configure_logging,
-        mock_parse_args,
+        self, main_mocks, mock_service, use_config_file
     ):
         """Test that logging settings are loaded from config file."""
-        mock_args = self._create_minimal_args(
-            config=Path("/config.yaml"),
+        use_config_file(
+            {
+                "data_dir": "/tmp",
+                "service_id": "config-service",
+                "ingress_server_url": "https://config.example.com",
+                "log_level": "DEBUG",
+                "rich_logs": True,
+            }
+        )
+        main_mocks["parse_args"].return_value = self._create_minimal_args(
+            config=CONFIG_PATH,
             data_dir=None,  # Let config provide this
             service_id=None,  # Let config provide this
             ingress_server_url=None,  # Let config provide this
-            ingress_server_auth_token="test-token",
         )
-        mock_parse_args.return_value = mock_args
-
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
 
         result = main()
 
         assert result == 0
         # Verify logging was configured with values from config file
-        mock_configure_logging.assert_called_once_with("DEBUG", True)
+        main_mocks["configure_logging"].assert_called_once_with("DEBUG", True)
         mock_service.run.assert_called_once()
 
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data="data_dir: /tmp\nservice_id: config-service\ningress_server_url: https://config.example.com\nlog_level: WARNING\nrich_logs: false",
-    )
-    @patch("src.main.DataCollectorService")
     def test_main_logging_cli_overrides_config(
-        self,
-        mock_service_class,
-        mock_open_file,
-        mock_configure_logging,
-        mock_parse_args,
+        self, main_mocks, mock_service, use_config_file
     ):
         """Test that CLI logging settings override config file."""
-        mock_args = self._create_minimal_args(
-            config=Path("/config.yaml"),
+        use_config_file(
+            {
+                "data_dir": "/tmp",
+                "service_id": "config-service",
+                "ingress_server_url": "https://config.example.com",
+                "log_level": "WARNING",
+                "rich_logs": False,
+            }
+        )
+        main_mocks["parse_args"].return_value = self._create_minimal_args(
+            config=CONFIG_PATH,
             log_level="ERROR",  # Override config file's WARNING
             rich_logs=True,  # Override config file's false
             data_dir=None,  # Let config provide this
             service_id=None,  # Let config provide this
             ingress_server_url=None,  # Let config provide this
-            ingress_server_auth_token="test-token",
         )
-        mock_parse_args.return_value = mock_args
-
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
 
         result = main()
 
         assert result == 0
         # Verify logging was configured with CLI values, not config values
-        mock_configure_logging.assert_called_once_with("ERROR", True)
+        main_mocks["configure_logging"].assert_called_once_with("ERROR", True)
         mock_service.run.assert_called_once()
 
-    @patch("src.main.parse_args")
-    @patch("src.main.configure_logging")
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data="data_dir: /tmp\nservice_id: config-service\ningress_server_url: https://config.example.com\nlog_level: debug\nrich_logs: true",
-    )
-    @patch("src.main.DataCollectorService")
     def test_main_logging_case_insensitive_from_config(
-        self,
-        mock_service_class,
-        mock_open_file,
-        mock_configure_logging,
-        mock_parse_args,
+        self, main_mocks, mock_service, use_config_file
     ):
         """Test that log_level from config file is case-insensitive."""
-        mock_args = self._create_minimal_args(
-            config=Path("/config.yaml"),
+        use_config_file(
+            {
+                "data_dir": "/tmp",
+                "service_id": "config-service",
+                "ingress_server_url": "https://config.example.com",
+                "log_level": "debug",
+                "rich_logs": True,
+            }
+        )
+        main_mocks["parse_args"].return_value = self._create_minimal_args(
+            config=CONFIG_PATH,
             data_dir=None,  # Let config provide this
             service_id=None,  # Let config provide this
             ingress_server_url=None,  # Let config provide this
-            ingress_server_auth_token="test-token",
         )
-        mock_parse_args.return_value = mock_args
-
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
 
         result = main()
 
         assert result == 0
         # Verify lowercase "debug" from config is uppercased to "DEBUG"
-        mock_configure_logging.assert_called_once_with("DEBUG", True)
+        main_mocks["configure_logging"].assert_called_once_with("DEBUG", True)
         mock_service.run.assert_called_once()
@@ -1,12 +1,13 @@
 """Tests for src.settings module."""
 
 import pytest
-import tempfile
 from pathlib import Path
 from pydantic import ValidationError
 
 from src.settings import DataCollectorSettings
 
+DATA_DIR = Path("/tmp")
+
 
 class TestDataCollectorSettings:
     """Test cases for DataCollectorSettings."""
@@ -14,7 +15,7 @@ class TestDataCollectorSettings:
     def test_valid_settings_creation(self):
         """Test creating settings with valid data."""
         settings = DataCollectorSettings(
-            data_dir=Path("/tmp"),
+            data_dir=DATA_DIR,
             service_id="test-service",
             ingress_server_url="https://example.com/api/v1/upload",
             ingress_server_auth_token="test-token",
@@ -26,7 +27,7 @@ class TestDataCollectorSettings:
             allowed_subdirs=[],
         )
 
-        assert settings.data_dir == Path("/tmp")
+        assert settings.data_dir == DATA_DIR
         assert settings.service_id == "test-service"
         assert settings.ingress_server_url == "https://example.com/api/v1/upload"
         assert settings.ingress_server_auth_token == "test-token"
@@ -36,62 +37,65 @@ class TestDataCollectorSettings:
         assert settings.ingress_connection_timeout == 30
         assert settings.retry_interval == 120
 
-    def test_invalid_data_dir(self):
-        """Test validation error for non-existent data directory."""
+    @pytest.mark.parametrize(
+        "overrides,error_type",
+        [
+            pytest.param(
+                {"data_dir": Path("/non/existent/path")},
+                "path_not_directory",
+                id="missing-data-dir",
+            ),
+            pytest.param(
+                {"collection_interval": -1},
+                "greater_than_equal",
+                id="negative-collection-interval",
+            ),
+        ],
+    )
+    def test_invalid_settings(self, shared_tmpdir, overrides, error_type):
+        """Test validation errors for invalid setting values."""
         with pytest.raises(ValidationError) as exc_info:
             DataCollectorSettings(
-                data_dir=Path("/non/existent/path"),
-                service_id="test-service",
-                ingress_server_url="https://example.com/api/v1/upload",
+                **{
+                    "data_dir": shared_tmpdir,
+                    "service_id": "test-service",
+                    "ingress_server_url": "https://example.com/api/v1/upload",
+                    **overrides,
+                }
             )
 
-        assert "path_not_directory" in str(exc_info.value)
-
-    def test_invalid_collection_interval(self):
-        """Test validation error for negative collection interval."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with pytest.raises(ValidationError) as exc_info:
-                DataCollectorSettings(
-                    data_dir=Path(tmpdir),
-                    service_id="test-service",
-                    ingress_server_url="https://example.com/api/v1/upload",
-                    collection_interval=-1,
-                )
+        assert any(err["type"] == error_type for err in exc_info.value.errors())
 
-            assert "greater_than" in str(exc_info.value)
-
-    def test_zero_collection_interval(self):
+    def test_zero_collection_interval(self, shared_tmpdir):
         """Test validation error for zero collection interval."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            DataCollectorSettings(
-                data_dir=Path(tmpdir),
-                service_id="test-service",
-                ingress_server_url="https://example.com/api/v1/upload",
-                ingress_server_auth_token="test-token",
-                identity_id="test-identity",
-                collection_interval=0,
-                cleanup_after_send=True,
-                ingress_connection_timeout=30,
-                retry_interval=120,
-                allowed_subdirs=[],
-            )
+        DataCollectorSettings(
+            data_dir=shared_tmpdir,
+            service_id="test-service",
+            ingress_server_url="https://example.com/api/v1/upload",
+            ingress_server_auth_token="test-token",
+            identity_id="test-identity",
+            collection_interval=0,
+            cleanup_after_send=True,
+            ingress_connection_timeout=30,
+            retry_interval=120,
+            allowed_subdirs=[],
+        )
 
-    def test_settings_immutability(self):
+    def test_settings_immutability(self, shared_tmpdir):
         """Test that settings are immutable after creation."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            settings = DataCollectorSettings(
-                data_dir=Path(tmpdir),
-                service_id="test-service",
-                ingress_server_url="https://example.com/api/v1/upload",
-                ingress_server_auth_token="test-token",
-                identity_id="test-identity",
-                collection_interval=0,
-                cleanup_after_send=True,
-                ingress_connection_timeout=30,
-                retry_interval=120,
-                allowed_subdirs=[],
-            )
+        settings = DataCollectorSettings(
+            data_dir=shared_tmpdir,
+            service_id="test-service",
+            ingress_server_url="https://example.com/api/v1/upload",
+            ingress_server_auth_token="test-token",
+            identity_id="test-identity",
+            collection_interval=0,
+            cleanup_after_send=True,
+            ingress_connection_timeout=30,
+            retry_interval=120,
+            allowed_subdirs=[],
+        )
 
-            # Pydantic models are immutable by default, test this
-            with pytest.raises(ValidationError):
-                settings.service_id = "modified-service"
+        # Pydantic models are immutable by default, test this
+        with pytest.raises(ValidationError):
+            settings.service_id = "modified-service"